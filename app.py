@@ -354,7 +354,7 @@ def display_all_users_analytics():
     with col1:
         st.subheader("🔥 Customer Journey Funnel")
         try:
-            fig_funnel = visuals.create_funnel_chart(customers_df, orders_df)
+            fig_funnel = visuals.create_funnel_chart(customers_df)
             st.plotly_chart(fig_funnel, width='stretch')
         except Exception as e:
             st.error(f"Error creating funnel chart: {e}")
@@ -430,7 +430,7 @@ def display_all_users_analytics():
     # Cohort Analysis
     st.subheader("👥 Customer Retention Analysis")
     try:
-        fig_cohort = visuals.create_cohort_retention_chart(customers_df, orders_df)
+        fig_cohort = visuals.create_cohort_retention_chart(orders_df)
         st.plotly_chart(fig_cohort, width='stretch')
     except Exception as e:
         st.error(f"Error creating cohort chart: {e}")
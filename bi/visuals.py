@@ -3,23 +3,266 @@ Visualization module for creating charts and graphs.
 Uses matplotlib and plotly for consistent, professional charts.
 Enhanced with advanced visualization types for comprehensive analytics.
 """
-from typing import Optional, Dict, Any
+from __future__ import annotations
+
+import io
+import threading
+import weakref
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import config
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+# Line charts drop per-point markers above this many points; at that density
+# they only add draw calls without making the trend easier to read.
+_MARKER_POINT_LIMIT = 100
+
+# Interactive scatter charts switch from SVG to WebGL traces above this many
+# points; below it SVG gives crisper markers and hover at negligible cost.
+_WEBGL_POINT_LIMIT = 2000
+
+
+# PNG encoder settings for chart output. Flat-colour plots compress nearly as
+# well at zlib level 3 as at the default 6, for a fraction of the encode time.
+_PNG_PIL_KWARGS = {'compress_level': 3, 'optimize': False}
+_CHART_DPI = 150
+
+
+# Shared chart styling. FuncFormatter keeps no per-axis state that the
+# callback reads, so one instance can serve every currency axis.
+_CURRENCY_FORMATTER = FuncFormatter(lambda x, _: f'₹{x:,.0f}')
+
+_SEGMENT_COLORS = {'new': '#4CAF50', 'returning': '#2196F3',
+                   'vip': '#FFC107', 'at_risk': '#F44336'}
+
+# Segment colours as a lookup table indexed by position in _SEGMENT_INDEX;
+# the trailing fallback grey is what -1 (unknown segment) selects.
+_SEGMENT_INDEX = pd.Index(list(_SEGMENT_COLORS))
+_SEGMENT_COLOR_LUT = np.array([*_SEGMENT_COLORS.values(), '#999999'])
+
+# Qualitative palettes sampled once; bar charts take the first N rows.
+_PALETTE_SIZE = 20
+_PALETTES = {name: colormaps[name](np.arange(_PALETTE_SIZE)) for name in ('Set2', 'Set3')}
+
+
+def _palette(name: str, n: int) -> np.ndarray:
+    """Return the first ``n`` RGBA colours of a qualitative colormap."""
+    if n <= _PALETTE_SIZE:
+        return _PALETTES[name][:n]
+    return colormaps[name](np.arange(n))
+
+
+def _save_fig(fig: Figure, target) -> None:
+    """Save a chart figure as PNG to a path or binary file object."""
+    fig.savefig(target, format='png', dpi=_CHART_DPI, bbox_inches='tight',
+                pil_kwargs=_PNG_PIL_KWARGS)
+
+
+def _render_to_buffer(fig: Figure) -> bytes:
+    """Encode a chart figure as PNG bytes in memory."""
+    buf = io.BytesIO()
+    _save_fig(fig, buf)
+    return buf.getvalue()
+
+
+def _new_figure(figsize: tuple) -> tuple:
+    """
+    Create a Figure/Axes pair bound directly to an Agg canvas.
+    
+    Bypasses pyplot's figure manager, so figures are never registered
+    globally and are freed as soon as the caller drops them.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    return fig, ax
+
+
+def _blank_figure(message: str = 'No data available') -> Figure:
+    """
+    Placeholder figure for charts with no data.
+    
+    A new Figure is built on every call, so callers may modify or close it.
+    """
+    fig, ax = _new_figure(figsize=(10, 6))
+    ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=14)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    return fig
+
+
+@lru_cache(maxsize=8)
+def _blank_png(message: str = 'No data available') -> bytes:
+    """PNG encoding of the placeholder figure, rendered once."""
+    return _render_to_buffer(_blank_figure(message))
+
+
+def _blank_chart(save_path: Optional[Path] = None) -> Figure:
+    """Return a fresh placeholder figure, writing its cached PNG if requested."""
+    if save_path:
+        Path(save_path).write_bytes(_blank_png())
+    return _blank_figure()
+
+
+# Per-thread chart templates reused across customers, see _chart_template.
+_chart_templates = threading.local()
+
+
+# Parsed order_date columns keyed by id() of the source orders frame, so the
+# dashboard's many charts over one frame parse the dates only once. Entries
+# are evicted when the frame is garbage collected.
+_order_dates_cache: Dict[int, tuple] = {}
+
+
+def _order_dates(orders_df: pd.DataFrame) -> pd.Series:
+    """
+    Return orders_df['order_date'] as datetime64, parsing at most once per frame.
+    
+    Frames are treated as read-only: replacing the order_date column of a
+    frame in place after it has been charted is not detected.
+    """
+    dates = orders_df['order_date']
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    
+    key = id(orders_df)
+    cached = _order_dates_cache.get(key)
+    if cached is not None:
+        frame_ref, index, parsed = cached
+        if frame_ref() is orders_df and index is orders_df.index:
+            return parsed
+    
+    parsed = pd.to_datetime(dates)
+    _order_dates_cache[key] = (weakref.ref(orders_df), orders_df.index, parsed)
+    weakref.finalize(orders_df, _order_dates_cache.pop, key, None)
+    return parsed
+
+
+# Plotly is imported on first use so that callers needing only the
+# matplotlib PNG charts don't pay its import cost.
+@cache
+def _go():
+    import plotly.graph_objects as go
+    return go
+
+
+@cache
+def _px():
+    import plotly.express as px
+    return px
+
+
+@cache
+def _make_subplots():
+    from plotly.subplots import make_subplots
+    return make_subplots
+
+
+def _build_spend_axes() -> tuple:
+    """Create the styled, data-free Figure/Axes/Line for the spend chart."""
+    fig, ax = _new_figure(figsize=(10, 6))
+    line, = ax.plot([], [], linewidth=2, markersize=6, color='#0066cc')
+    
+    ax.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Cumulative Spend (₹)', fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    
+    # Format y-axis as currency
+    ax.yaxis.set_major_formatter(
+        _CURRENCY_FORMATTER
+    )
+    return fig, ax, line
+
+
+def _build_category_axes() -> tuple:
+    """Create the styled, data-free Figure/Axes for the category chart."""
+    fig, ax = _new_figure(figsize=(10, 6))
+    
+    ax.set_xlabel('Spend (₹)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Category', fontsize=12, fontweight='bold')
+    ax.grid(True, axis='x', alpha=0.3)
+    
+    # Format x-axis as currency
+    ax.xaxis.set_major_formatter(
+        _CURRENCY_FORMATTER
+    )
+    return fig, ax
+
+
+def _chart_template(name: str, build) -> tuple:
+    """
+    Return this thread's reusable chart template, building it on first use.
+    
+    Batch rendering only swaps the data artists on these templates instead
+    of constructing new axes, tick machinery and fonts for every customer.
+    """
+    templates = _chart_templates.__dict__
+    if name not in templates:
+        templates[name] = build()
+    return templates[name]
+
+
+def _plot_values(values: pd.Series) -> np.ndarray:
+    """
+    Chart-ready values: floats as float32, other dtypes untouched.
+    
+    Seven significant digits are plenty for a plotted value, and float32
+    halves the bytes the downsampling and Plotly serialization touch.
+    """
+    if pd.api.types.is_float_dtype(values.dtype):
+        return values.to_numpy(dtype=np.float32)
+    return values.to_numpy()
+
+
+def _downsample_m4(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_bins: int
+) -> tuple:
+    """
+    Reduce a sorted time series with M4 aggregation.
+    
+    The x range is split into n_bins equal-width bins (one per output pixel
+    column) and only the first, last, min and max point of each bin are
+    kept, which rasterises identically to the full series at that width.
+    Series with at most 4 * n_bins points are returned unchanged.
+    """
+    if len(x) <= 4 * n_bins:
+        return x, y
+    
+    x_num = x.astype(np.int64)
+    edges = np.linspace(x_num[0], x_num[-1], n_bins + 1)
+    bins = np.clip(np.searchsorted(edges, x_num, side='right') - 1, 0, n_bins - 1)
+    
+    # Bins are contiguous runs because x is sorted
+    firsts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    lasts = np.r_[firsts[1:], len(x)] - 1
+    
+    # Sorting by (bin, y) puts each bin's min first and max last in its run
+    by_value = np.lexsort((y, bins))
+    keep = np.unique(np.concatenate([firsts, lasts, by_value[firsts], by_value[lasts]]))
+    return x[keep], y[keep]
 
 
 def create_spend_over_time_chart(
     trend_df: pd.DataFrame,
     customer_name: str,
-    save_path: Optional[Path] = None
-) -> plt.Figure:
+    save_path: Optional[Path] = None,
+    tight: bool = True,
+    reuse_figure: bool = False
+) -> Figure:
     """
     Create a line chart showing spending over time.
     
@@ -27,40 +270,44 @@ def create_spend_over_time_chart(
         trend_df: DataFrame with 'date' and 'spend' columns
         customer_name: Name for chart title
         save_path: Optional path to save the chart
+        tight: Apply tight_layout before returning (redundant when the
+            caller only saves with bbox_inches='tight')
+        reuse_figure: Draw onto a per-thread template figure instead of a
+            new one. The returned figure is overwritten by the next call.
     
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
     if len(trend_df) == 0:
-        ax.text(0.5, 0.5, 'No data available', 
-                ha='center', va='center', fontsize=14)
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
+        return _blank_chart(save_path)
+    
+    if reuse_figure:
+        fig, ax, line = _chart_template('spend', _build_spend_axes)
+        for collection in list(ax.collections):
+            collection.remove()
     else:
-        # Ensure date is datetime
-        dates = pd.to_datetime(trend_df['date'])
-        ax.plot(dates, trend_df['spend'], marker='o', 
-                linewidth=2, markersize=6, color='#0066cc')
-        ax.fill_between(dates, trend_df['spend'], alpha=0.3, color='#0066cc')
-        
-        ax.set_xlabel('Date', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Cumulative Spend (₹)', fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-        
-        # Format y-axis as currency
-        ax.yaxis.set_major_formatter(
-            plt.FuncFormatter(lambda x, p: f'₹{x:,.0f}')
-        )
+        fig, ax, line = _build_spend_axes()
+    
+    # Ensure date is datetime
+    dates, spend = _downsample_m4(
+        pd.to_datetime(trend_df['date']).to_numpy(), _plot_values(trend_df['spend']),
+        n_bins=10 * _CHART_DPI
+    )
+    ax.xaxis.update_units(dates)
+    line.set_data(dates, spend)
+    line.set_marker('o' if len(trend_df) <= _MARKER_POINT_LIMIT else None)
+    ax.fill_between(dates, spend, alpha=0.3, color='#0066cc')
+    ax.relim()
+    ax.autoscale_view()
     
     ax.set_title(f'Spending Trend - {customer_name}', 
                  fontsize=14, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    if tight:
+        fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        _save_fig(fig, save_path)
     
     return fig
 
@@ -68,8 +315,10 @@ def create_spend_over_time_chart(
 def create_category_share_chart(
     category_df: pd.DataFrame,
     customer_name: str,
-    save_path: Optional[Path] = None
-) -> plt.Figure:
+    save_path: Optional[Path] = None,
+    tight: bool = True,
+    reuse_figure: bool = False
+) -> Figure:
     """
     Create a bar chart showing spending by category.
     
@@ -77,60 +326,65 @@ def create_category_share_chart(
         category_df: DataFrame with 'category' and 'amount' columns
         customer_name: Name for chart title
         save_path: Optional path to save the chart
+        tight: Apply tight_layout before returning (redundant when the
+            caller only saves with bbox_inches='tight')
+        reuse_figure: Draw onto a per-thread template figure instead of a
+            new one. The returned figure is overwritten by the next call.
     
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
     if len(category_df) == 0:
-        ax.text(0.5, 0.5, 'No data available', 
-                ha='center', va='center', fontsize=14)
-        ax.set_xlim(0, 1)
-        ax.set_ylim(0, 1)
+        return _blank_chart(save_path)
+    
+    if reuse_figure:
+        fig, ax = _chart_template('category', _build_category_axes)
+        for container in list(ax.containers):
+            container.remove()
     else:
-        colors = plt.cm.Set3(range(len(category_df)))
-        ax.barh(category_df['category'], category_df['amount'], color=colors)
-        
-        ax.set_xlabel('Spend (₹)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Category', fontsize=12, fontweight='bold')
-        ax.grid(True, axis='x', alpha=0.3)
-        
-        # Format x-axis as currency
-        ax.xaxis.set_major_formatter(
-            plt.FuncFormatter(lambda x, p: f'₹{x:,.0f}')
-        )
+        fig, ax = _build_category_axes()
+    
+    # Plot on integer positions with explicit tick labels; a categorical
+    # axis would keep accumulating categories across reused renders.
+    positions = np.arange(len(category_df))
+    colors = _palette('Set3', len(category_df))
+    ax.barh(positions, category_df['amount'], color=colors)
+    ax.set_yticks(positions, labels=category_df['category'])
+    ax.relim()
+    ax.autoscale_view()
     
     ax.set_title(f'Category Spending - {customer_name}', 
                  fontsize=14, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    if tight:
+        fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        _save_fig(fig, save_path)
     
     return fig
 
 
 def create_segment_distribution_chart(
     segment_df: pd.DataFrame,
-    save_path: Optional[Path] = None
-) -> plt.Figure:
+    save_path: Optional[Path] = None,
+    tight: bool = True
+) -> Figure:
     """
     Create a bar chart showing customer distribution by segment.
     
     Args:
         segment_df: DataFrame with 'segment' and 'count' columns
         save_path: Optional path to save the chart
+        tight: Apply tight_layout before returning (redundant when the
+            caller only saves with bbox_inches='tight')
     
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure(figsize=(10, 6))
     
-    colors = {'new': '#4CAF50', 'returning': '#2196F3', 
-              'vip': '#FFC107', 'at_risk': '#F44336'}
-    bar_colors = [colors.get(seg, '#999999') for seg in segment_df['segment']]
+    bar_colors = _SEGMENT_COLOR_LUT[_SEGMENT_INDEX.get_indexer(segment_df['segment'])]
     
     ax.bar(segment_df['segment'], segment_df['count'], color=bar_colors)
     
@@ -140,31 +394,35 @@ def create_segment_distribution_chart(
                  fontsize=14, fontweight='bold', pad=20)
     ax.grid(True, axis='y', alpha=0.3)
     
-    plt.tight_layout()
+    if tight:
+        fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        _save_fig(fig, save_path)
     
     return fig
 
 
 def create_overall_category_chart(
     category_df: pd.DataFrame,
-    save_path: Optional[Path] = None
-) -> plt.Figure:
+    save_path: Optional[Path] = None,
+    tight: bool = True
+) -> Figure:
     """
     Create a bar chart showing overall revenue by category.
     
     Args:
         category_df: DataFrame with 'category' and 'revenue' columns
         save_path: Optional path to save the chart
+        tight: Apply tight_layout before returning (redundant when the
+            caller only saves with bbox_inches='tight')
     
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure(figsize=(10, 6))
     
-    colors = plt.cm.Set2(range(len(category_df)))
+    colors = _palette('Set2', len(category_df))
     ax.bar(category_df['category'], category_df['revenue'], color=colors)
     
     ax.set_xlabel('Product Category', fontsize=12, fontweight='bold')
@@ -172,42 +430,51 @@ def create_overall_category_chart(
     ax.set_title('Revenue by Product Category', 
                  fontsize=14, fontweight='bold', pad=20)
     ax.grid(True, axis='y', alpha=0.3)
-    plt.xticks(rotation=45, ha='right')
+    for label in ax.get_xticklabels():
+        label.set(rotation=45, ha='right')
     
     # Format y-axis as currency
     ax.yaxis.set_major_formatter(
-        plt.FuncFormatter(lambda x, p: f'₹{x:,.0f}')
+        _CURRENCY_FORMATTER
     )
     
-    plt.tight_layout()
+    if tight:
+        fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        _save_fig(fig, save_path)
     
     return fig
 
 
 def create_revenue_timeline_chart(
     revenue_df: pd.DataFrame,
-    save_path: Optional[Path] = None
-) -> plt.Figure:
+    save_path: Optional[Path] = None,
+    tight: bool = True
+) -> Figure:
     """
     Create a line chart showing revenue over time.
     
     Args:
         revenue_df: DataFrame with 'date' and 'revenue' columns
         save_path: Optional path to save the chart
+        tight: Apply tight_layout before returning (redundant when the
+            caller only saves with bbox_inches='tight')
     
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure(figsize=(12, 6))
     
     if len(revenue_df) > 0:
-        dates = pd.to_datetime(revenue_df['date'])
-        ax.plot(dates, revenue_df['revenue'], marker='o', 
+        dates, revenue = _downsample_m4(
+            pd.to_datetime(revenue_df['date']).to_numpy(), _plot_values(revenue_df['revenue']),
+            n_bins=12 * _CHART_DPI
+        )
+        ax.plot(dates, revenue,
+                marker='o' if len(revenue_df) <= _MARKER_POINT_LIMIT else None,
                 linewidth=2, markersize=6, color='#FF5722')
-        ax.fill_between(dates, revenue_df['revenue'], alpha=0.3, color='#FF5722')
+        ax.fill_between(dates, revenue, alpha=0.3, color='#FF5722')
         
         ax.set_xlabel('Date', fontsize=12, fontweight='bold')
         ax.set_ylabel('Revenue (₹)', fontsize=12, fontweight='bold')
@@ -215,15 +482,16 @@ def create_revenue_timeline_chart(
         
         # Format y-axis as currency
         ax.yaxis.set_major_formatter(
-            plt.FuncFormatter(lambda x, p: f'₹{x:,.0f}')
+            _CURRENCY_FORMATTER
         )
     
     ax.set_title('Revenue Over Time', fontsize=14, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    if tight:
+        fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        _save_fig(fig, save_path)
     
     return fig
 
@@ -242,6 +510,7 @@ def create_plotly_spend_chart(
     Returns:
         Plotly Figure object
     """
+    go = _go()
     if len(trend_df) == 0:
         fig = go.Figure()
         fig.add_annotation(
@@ -253,8 +522,8 @@ def create_plotly_spend_chart(
         fig = go.Figure()
         fig.add_trace(go.Scatter(
             x=pd.to_datetime(trend_df['date']),
-            y=trend_df['spend'],
-            mode='lines+markers',
+            y=_plot_values(trend_df['spend']),
+            mode='lines+markers' if len(trend_df) <= _MARKER_POINT_LIMIT else 'lines',
             name='Cumulative Spend',
             line=dict(color='#0066cc', width=3),
             marker=dict(size=8)
@@ -271,6 +540,37 @@ def create_plotly_spend_chart(
     return fig
 
 
+def render_all_customer_charts_to_bytes(
+    customer_name: str,
+    trend_df: pd.DataFrame,
+    category_df: pd.DataFrame
+) -> Dict[str, bytes]:
+    """
+    Render all charts for a customer as in-memory PNGs.
+    
+    Use this when the charts are only embedded or attached (e.g. in
+    emails), to avoid a write and read-back through the filesystem.
+    
+    Args:
+        customer_name: Customer name
+        trend_df: Spending trend data
+        category_df: Category spending data
+    
+    Returns:
+        Dictionary with PNG bytes per chart
+    """
+    charts = {
+        'spend_over_time': (trend_df, create_spend_over_time_chart),
+        'category_share': (category_df, create_category_share_chart),
+    }
+    # Empty charts reuse the cached placeholder PNG instead of drawing one
+    return {
+        name: _render_to_buffer(create(df, customer_name, tight=False, reuse_figure=True))
+        if len(df) else _blank_png()
+        for name, (df, create) in charts.items()
+    }
+
+
 def save_all_customer_charts(
     customer_id: str,
     customer_name: str,
@@ -294,20 +594,118 @@ def save_all_customer_charts(
     charts_dir.mkdir(parents=True, exist_ok=True)
     
     saved_charts = {}
+    rendered = render_all_customer_charts_to_bytes(customer_name, trend_df, category_df)
+    for name, png in rendered.items():
+        chart_path = charts_dir / f"{name}.png"
+        chart_path.write_bytes(png)
+        saved_charts[name] = chart_path
     
-    # Spend over time chart
-    spend_path = charts_dir / "spend_over_time.png"
-    fig1 = create_spend_over_time_chart(trend_df, customer_name, spend_path)
-    plt.close(fig1)
-    saved_charts['spend_over_time'] = spend_path
+    return saved_charts
+
+
+def _mpl_engagement_heatmap(pivot_data: pd.DataFrame) -> Figure:
+    """Static matplotlib rendering of the engagement heatmap."""
+    fig, ax = _new_figure(figsize=(10, 6))
+    
+    image = ax.imshow(pivot_data.values, cmap='viridis', aspect='auto')
+    ax.set_xticks(range(len(pivot_data.columns)), labels=pivot_data.columns)
+    ax.set_yticks(range(len(pivot_data.index)), labels=pivot_data.index)
+    for (row, col), value in np.ndenumerate(pivot_data.values):
+        if not np.isnan(value):
+            ax.text(col, row, f'{value:.1f}', ha='center', va='center',
+                    color='white', fontsize=12)
+    fig.colorbar(image, ax=ax, label='Avg Engagement Score')
+    
+    ax.set_xlabel('Buying Behavior', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Customer Segment', fontsize=12, fontweight='bold')
+    ax.set_title('Customer Engagement Heatmap by Segment & Behavior',
+                 fontsize=14, fontweight='bold', pad=20)
     
-    # Category share chart
-    category_path = charts_dir / "category_share.png"
-    fig2 = create_category_share_chart(category_df, customer_name, category_path)
-    plt.close(fig2)
-    saved_charts['category_share'] = category_path
+    return fig
+
+
+def _mpl_funnel(
+    stages: List[str],
+    values: List[int],
+    colors: List[str],
+    title: str,
+    save_path: Path
+) -> Figure:
+    """Static matplotlib rendering of a funnel as centred horizontal bars."""
+    fig, ax = _new_figure(figsize=(10, 6))
+    
+    widths = np.asarray(values, dtype=np.float64)
+    positions = np.arange(len(stages))
+    ax.barh(positions, widths, left=-widths / 2, color=colors)
+    ax.set_yticks(positions, labels=stages)
+    ax.invert_yaxis()
+    ax.set_xticks([])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    
+    initial = widths[0] if len(widths) > 0 and widths[0] > 0 else 1.0
+    for position, width in zip(positions, widths):
+        ax.text(0, position, f'{width:,.0f} ({width / initial:.0%})',
+                ha='center', va='center', fontsize=12, fontweight='bold')
+    
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+    
+    _save_fig(fig, save_path)
+    return fig
+
+
+def _engagement_heatmap_figure(pivot_data: pd.DataFrame) -> go.Figure:
+    """Build the Plotly engagement heatmap for a segment x behavior pivot."""
+    go = _go()
+    fig = go.Figure(data=go.Heatmap(
+        z=pivot_data.values,
+        x=pivot_data.columns,
+        y=pivot_data.index,
+        colorscale='Viridis',
+        text=pivot_data.values.round(1),
+        texttemplate='%{text}',
+        textfont={"size": 12},
+        colorbar=dict(title="Avg Engagement Score")
+    ))
     
-    return saved_charts
+    fig.update_layout(
+        title='Customer Engagement Heatmap by Segment & Behavior',
+        xaxis_title='Buying Behavior',
+        yaxis_title='Customer Segment',
+        height=500
+    )
+    return fig
+
+
+@cache
+def _start_kaleido() -> None:
+    """Keep one Kaleido browser alive for all exports (Kaleido >= 1.0)."""
+    try:
+        import kaleido
+    except ImportError:
+        return
+    # Older Kaleido releases keep their own subprocess and lack this hook
+    start_sync_server = getattr(kaleido, 'start_sync_server', None)
+    if start_sync_server is not None:
+        start_sync_server(silence_warnings=True)
+
+
+@lru_cache(maxsize=32)
+def _heatmap_png(values: bytes, index: tuple, columns: tuple, backend: str) -> bytes:
+    """
+    PNG for an engagement pivot, memoised on its contents.
+    
+    A report run renders the same heatmap for every customer, so only the
+    first call pays for the export.
+    """
+    pivot_data = pd.DataFrame(
+        np.frombuffer(values).reshape(len(index), len(columns)),
+        index=list(index), columns=list(columns)
+    )
+    if backend == 'static':
+        return _render_to_buffer(_mpl_engagement_heatmap(pivot_data))
+    _start_kaleido()
+    return _engagement_heatmap_figure(pivot_data).to_image(format='png')
 
 
 def create_engagement_heatmap(
@@ -319,18 +717,20 @@ def create_engagement_heatmap(
     
     Args:
         customers_df: Customer dataframe
-        save_path: Optional path to save the chart
+        save_path: Optional path to save the chart as PNG
     
     Returns:
         Plotly Figure object
     """
+    go = _go()
     # Pivot data for heatmap
     if 'engagement_score' in customers_df.columns and 'buying_behavior' in customers_df.columns:
         pivot_data = customers_df.pivot_table(
             values='engagement_score',
             index='segment',
             columns='buying_behavior',
-            aggfunc='mean'
+            aggfunc='mean',
+            observed=True
         )
     else:
         # Return empty figure if columns don't exist
@@ -342,55 +742,50 @@ def create_engagement_heatmap(
         )
         return fig
     
-    fig = go.Figure(data=go.Heatmap(
-        z=pivot_data.values,
-        x=pivot_data.columns,
-        y=pivot_data.index,
-        colorscale='Viridis',
-        text=pivot_data.values.round(1),
-        texttemplate='%{text}',
-        textfont={"size": 12},
-        colorbar=dict(title="Avg Engagement Score")
-    ))
-    
-    fig.update_layout(
-        title='Customer Engagement Heatmap by Segment & Behavior',
-        xaxis_title='Buying Behavior',
-        yaxis_title='Customer Segment',
-        height=500
-    )
+    fig = _engagement_heatmap_figure(pivot_data)
     
     if save_path:
-        fig.write_image(str(save_path))
+        Path(save_path).write_bytes(_heatmap_png(
+            np.ascontiguousarray(pivot_data.to_numpy(dtype=np.float64)).tobytes(),
+            tuple(pivot_data.index),
+            tuple(pivot_data.columns),
+            config.RENDER_BACKEND
+        ))
     
     return fig
 
 
 def create_funnel_chart(
     customers_df: pd.DataFrame,
-    orders_df: pd.DataFrame
+    save_path: Optional[Path] = None
 ) -> go.Figure:
     """
     Create a funnel chart showing customer journey stages.
     
     Args:
         customers_df: Customer dataframe
-        orders_df: Orders dataframe
+        save_path: Optional path to save the chart as PNG
     
     Returns:
         Plotly Figure object
     """
-    # Calculate funnel metrics
+    go = _go()
+    # Calculate funnel metrics from a single pass over the segment column
+    segment_counts = customers_df['segment'].value_counts()
     total_customers = len(customers_df)
-    active_customers = customers_df[customers_df['segment'] != 'at_risk'].shape[0]
-    returning_plus = customers_df[customers_df['segment'].isin(['returning', 'vip'])].shape[0]
-    vip_customers = customers_df[customers_df['segment'] == 'vip'].shape[0]
+    vip_customers = int(segment_counts.get('vip', 0))
+    returning_plus = int(segment_counts.get('returning', 0)) + vip_customers
+    active_customers = total_customers - int(segment_counts.get('at_risk', 0))
+    
+    stages = ['All Customers', 'Active', 'Returning+', 'VIP']
+    values = [total_customers, active_customers, returning_plus, vip_customers]
+    stage_colors = ['#2196F3', '#4CAF50', '#FF9800', '#FFC107']
     
     fig = go.Figure(go.Funnel(
-        y=['All Customers', 'Active', 'Returning+', 'VIP'],
-        x=[total_customers, active_customers, returning_plus, vip_customers],
+        y=stages,
+        x=values,
         textinfo="value+percent initial",
-        marker=dict(color=['#2196F3', '#4CAF50', '#FF9800', '#FFC107'])
+        marker=dict(color=stage_colors)
     ))
     
     fig.update_layout(
@@ -398,30 +793,34 @@ def create_funnel_chart(
         height=500
     )
     
+    if save_path:
+        if config.RENDER_BACKEND == 'static':
+            _mpl_funnel(stages, values, stage_colors, 'Customer Journey Funnel', save_path)
+        else:
+            fig.write_image(str(save_path))
+    
     return fig
 
 
 def create_cohort_retention_chart(
-    customers_df: pd.DataFrame,
     orders_df: pd.DataFrame
 ) -> go.Figure:
     """
     Create a cohort retention analysis chart.
     
     Args:
-        customers_df: Customer dataframe
         orders_df: Orders dataframe
     
     Returns:
         Plotly Figure object
     """
+    go = _go()
     # Simplified retention: customers with orders in different months
-    orders_copy = orders_df.copy()
-    orders_copy['order_date'] = pd.to_datetime(orders_copy['order_date'])
-    orders_copy['month'] = orders_copy['order_date'].dt.to_period('M')
+    months = _order_dates(orders_df).dt.to_period('M')
     
-    # Count unique customers per month
-    monthly_customers = orders_copy.groupby('month')['customer_id'].nunique()
+    # Count unique customers per month, grouping on the external month key
+    # rather than a copy of the frame with an added column
+    monthly_customers = orders_df['customer_id'].groupby(months).nunique()
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -453,6 +852,8 @@ def create_ltv_distribution(
     Returns:
         Plotly Figure object
     """
+    go = _go()
+    px = _px()
     if 'lifetime_value' not in customers_df.columns:
         fig = go.Figure()
         fig.add_annotation(
@@ -469,12 +870,7 @@ def create_ltv_distribution(
         nbins=30,
         title='Customer Lifetime Value Distribution by Segment',
         labels={'lifetime_value': 'Lifetime Value (₹)', 'count': 'Number of Customers'},
-        color_discrete_map={
-            'new': '#4CAF50',
-            'returning': '#2196F3',
-            'vip': '#FFC107',
-            'at_risk': '#F44336'
-        }
+        color_discrete_map=_SEGMENT_COLORS
     )
     
     fig.update_layout(height=500)
@@ -482,6 +878,23 @@ def create_ltv_distribution(
     return fig
 
 
+def _normalize_to_max(values: np.ndarray) -> np.ndarray:
+    """
+    Scale each column of a 2-D array to 0-100 relative to its column max.
+    
+    Columns whose max is not positive are returned as zeros.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    maxes = values.max(axis=0) if len(values) > 0 else np.zeros(values.shape[1])
+    
+    # Divide straight into a zeroed output; columns with no positive max are
+    # skipped by the mask rather than computed and then discarded.
+    normalized = np.zeros_like(values)
+    np.divide(values, maxes, out=normalized, where=maxes > 0)
+    normalized *= 100
+    return normalized
+
+
 def create_segment_comparison_chart(
     customers_df: pd.DataFrame,
     orders_df: pd.DataFrame
@@ -496,47 +909,58 @@ def create_segment_comparison_chart(
     Returns:
         Plotly Figure object
     """
-    # Calculate metrics by segment
-    segment_metrics = []
+    go = _go()
+    # Calculate metrics by segment with one join + groupby rather than a
+    # boolean mask and isin() scan per segment
+    segments = ['new', 'returning', 'vip', 'at_risk']
+    order_segments = orders_df[['customer_id', 'amount']].merge(
+        customers_df[['customer_id', 'segment']], on='customer_id', how='inner'
+    )
+    order_stats = order_segments.groupby('segment', observed=True)['amount'].agg(
+        avg_order_value='mean', total_orders='size'
+    )
     
-    for segment in ['new', 'returning', 'vip', 'at_risk']:
-        seg_customers = customers_df[customers_df['segment'] == segment]
-        seg_orders = orders_df[orders_df['customer_id'].isin(seg_customers['customer_id'])]
-        
-        metrics = {
-            'segment': segment,
-            'avg_order_value': seg_orders['amount'].mean() if len(seg_orders) > 0 else 0,
-            'total_orders': len(seg_orders),
-            'avg_engagement': seg_customers['engagement_score'].mean() if 'engagement_score' in seg_customers else 50,
-            'response_rate': seg_customers['response_rate'].mean() if 'response_rate' in seg_customers else 0.5,
-            'customer_count': len(seg_customers)
-        }
-        segment_metrics.append(metrics)
+    customer_groups = customers_df.groupby('segment', observed=True)
+    customer_stats = customer_groups.size().rename('customer_count').to_frame()
+    customer_stats['avg_engagement'] = (
+        customer_groups['engagement_score'].mean()
+        if 'engagement_score' in customers_df else 50
+    )
+    customer_stats['response_rate'] = (
+        customer_groups['response_rate'].mean()
+        if 'response_rate' in customers_df else 0.5
+    )
+    
+    metrics_df = customer_stats.join(order_stats, how='outer').reindex(segments)
+    count_cols = ['avg_order_value', 'total_orders', 'customer_count']
+    metrics_df[count_cols] = metrics_df[count_cols].fillna(0)
     
     # Normalize metrics to 0-100 scale for radar chart
-    metrics_df = pd.DataFrame(segment_metrics)
+    metrics_df = metrics_df.rename_axis('segment').reset_index()
+    
+    # Engagement is already 0-100 and response rate a 0-1 fraction; the
+    # remaining columns are scaled against their per-column max in one pass.
+    scaled = _normalize_to_max(
+        metrics_df[['avg_order_value', 'total_orders', 'customer_count']]
+        .to_numpy(dtype=np.float64)
+    )
+    normalized = np.column_stack([
+        scaled[:, 0],
+        scaled[:, 1],
+        metrics_df['avg_engagement'].to_numpy(dtype=np.float64),
+        metrics_df['response_rate'].to_numpy(dtype=np.float64) * 100,
+        scaled[:, 2]
+    ])
     
     fig = go.Figure()
     
-    colors = {'new': '#4CAF50', 'returning': '#2196F3', 
-              'vip': '#FFC107', 'at_risk': '#F44336'}
-    
-    for _, row in metrics_df.iterrows():
-        # Normalize each metric to 0-100 scale
-        normalized = [
-            (row['avg_order_value'] / metrics_df['avg_order_value'].max() * 100) if metrics_df['avg_order_value'].max() > 0 else 0,
-            (row['total_orders'] / metrics_df['total_orders'].max() * 100) if metrics_df['total_orders'].max() > 0 else 0,
-            row['avg_engagement'],
-            row['response_rate'] * 100,
-            (row['customer_count'] / metrics_df['customer_count'].max() * 100) if metrics_df['customer_count'].max() > 0 else 0
-        ]
-        
+    for segment, r in zip(metrics_df['segment'], normalized):
         fig.add_trace(go.Scatterpolar(
-            r=normalized,
+            r=r.tolist(),
             theta=['Avg Order Value', 'Total Orders', 'Engagement', 'Response Rate', 'Customer Count'],
             fill='toself',
-            name=row['segment'].upper(),
-            line_color=colors.get(row['segment'], '#999999')
+            name=segment.upper(),
+            line_color=_SEGMENT_COLORS.get(segment, '#999999')
         ))
     
     fig.update_layout(
@@ -563,31 +987,28 @@ def create_monthly_trend_comparison(
     Returns:
         Plotly Figure object
     """
-    orders_copy = orders_df.copy()
-    orders_copy['order_date'] = pd.to_datetime(orders_copy['order_date'])
-    orders_copy['month'] = orders_copy['order_date'].dt.to_period('M')
-    orders_copy['year'] = orders_copy['order_date'].dt.year
-    
-    monthly_revenue = orders_copy.groupby(['year', 'month'])['amount'].sum().reset_index()
-    monthly_revenue['month_str'] = monthly_revenue['month'].astype(str)
-    
-    fig = go.Figure()
-    
-    for year in monthly_revenue['year'].unique():
-        year_data = monthly_revenue[monthly_revenue['year'] == year]
-        fig.add_trace(go.Scatter(
-            x=year_data['month_str'],
-            y=year_data['amount'],
-            mode='lines+markers',
-            name=f'Year {year}',
-            line=dict(width=3),
-            marker=dict(size=8)
-        ))
+    px = _px()
+    # Group on a single datetime64[M] key and derive the year afterwards from
+    # the (small) aggregated index instead of hashing two derived columns.
+    months = _order_dates(orders_df).to_numpy().astype('datetime64[M]')
+    monthly_revenue = pd.Series(orders_df['amount'].to_numpy()).groupby(months).sum()
+    
+    month_keys = monthly_revenue.index.to_numpy().astype('datetime64[M]')
+    month_strs = np.datetime_as_string(month_keys, unit='M')
+    years = month_keys.astype('datetime64[Y]').astype(int) + 1970
+    amounts = monthly_revenue.to_numpy()
+    
+    fig = px.line(
+        x=month_strs, y=amounts, color=np.char.add('Year ', years.astype(str)),
+        markers=True
+    )
+    fig.update_traces(line_width=3, marker_size=8)
     
     fig.update_layout(
         title='Revenue Trends: Month-over-Month Comparison',
         xaxis_title='Month',
         yaxis_title='Revenue (₹)',
+        legend_title_text='',
         height=500,
         hovermode='x unified'
     )
@@ -609,6 +1030,7 @@ def create_customer_value_scatter(
     Returns:
         Plotly Figure object
     """
+    go = _go()
     if 'lifetime_value' not in customers_df.columns or 'engagement_score' not in customers_df.columns:
         fig = go.Figure()
         fig.add_annotation(
@@ -618,28 +1040,83 @@ def create_customer_value_scatter(
         )
         return fig
     
-    fig = px.scatter(
-        customers_df,
-        x='engagement_score',
-        y='lifetime_value',
-        color='segment',
-        size='lifetime_value',
-        hover_data=['name', 'segment', 'buying_behavior'],
+    # Build tooltip text once for the whole frame; each segment trace only
+    # indexes into the precomputed array.
+    hover_text = (
+        customers_df['name'].astype(str) + '<br>'
+        + customers_df['segment'].astype(str) + '<br>'
+        + customers_df['buying_behavior'].astype(str)
+    ).to_numpy()
+    # float32 is ample for plotting and halves the serialized arrays
+    engagement = customers_df['engagement_score'].to_numpy(dtype=np.float32)
+    ltv = customers_df['lifetime_value'].to_numpy(dtype=np.float32)
+    scatter = go.Scattergl if len(customers_df) > _WEBGL_POINT_LIMIT else go.Scatter
+    
+    # Same area-based sizing plotly-express uses for size= (max marker 20px)
+    max_ltv = ltv.max() if len(ltv) > 0 else 0
+    sizeref = 2.0 * max_ltv / (20 ** 2) if max_ltv > 0 else 1
+    
+    fig = go.Figure()
+    for segment, idx in customers_df.groupby('segment', sort=False, observed=True).indices.items():
+        fig.add_trace(scatter(
+            x=engagement[idx],
+            y=ltv[idx],
+            mode='markers',
+            name=segment,
+            hovertext=hover_text[idx],
+            hoverinfo='text+x+y',
+            marker=dict(
+                color=_SEGMENT_COLORS.get(segment, '#999999'),
+                size=ltv[idx],
+                sizemode='area',
+                sizeref=sizeref
+            )
+        ))
+    
+    fig.update_layout(
         title='Customer Value Analysis: Engagement vs Lifetime Value',
-        labels={
-            'engagement_score': 'Engagement Score',
-            'lifetime_value': 'Lifetime Value (₹)'
-        },
-        color_discrete_map={
-            'new': '#4CAF50',
-            'returning': '#2196F3',
-            'vip': '#FFC107',
-            'at_risk': '#F44336'
-        }
+        xaxis_title='Engagement Score',
+        yaxis_title='Lifetime Value (₹)',
+        legend_title_text='segment',
+        height=600
     )
     
-    fig.update_layout(height=600)
+    return fig
+
+
+def _faceted_metric_bars(
+    metrics_df: pd.DataFrame,
+    key: str,
+    metrics: Dict[str, tuple],
+    **color_kwargs: Any
+) -> go.Figure:
+    """
+    Build one bar facet per metric from a wide per-group metrics frame.
+    
+    Args:
+        metrics_df: One row per group with a column per metric
+        key: Group column, used for both the x axis and the colour
+        metrics: Metric column -> (facet title, y-axis title), in display order
+        **color_kwargs: Colour mapping passed straight to px.bar
     
+    Returns:
+        Plotly Figure object
+    """
+    px = _px()
+    long_df = metrics_df.melt(
+        id_vars=key, value_vars=list(metrics), var_name='metric', value_name='value'
+    )
+    fig = px.bar(
+        long_df, x=key, y='value', color=key, facet_col='metric',
+        category_orders={'metric': list(metrics)}, **color_kwargs
+    )
+    # Each metric has its own scale, so un-link the facet y axes
+    fig.update_yaxes(matches=None, showticklabels=True)
+    fig.update_xaxes(title_text=None)
+    fig.for_each_annotation(lambda a: a.update(text=metrics[a.text.split('=', 1)[1]][0]))
+    for col, (_, axis_title) in enumerate(metrics.values(), start=1):
+        fig.update_yaxes(title_text=axis_title, row=1, col=col)
+    fig.update_layout(legend_title_text='')
     return fig
 
 
@@ -655,6 +1132,7 @@ def create_channel_performance_chart(
     Returns:
         Plotly Figure object
     """
+    go = _go()
     if 'channel' not in orders_df.columns:
         fig = go.Figure()
         fig.add_annotation(
@@ -664,56 +1142,23 @@ def create_channel_performance_chart(
         )
         return fig
     
-    channel_metrics = orders_df.groupby('channel').agg({
+    channel_metrics = orders_df.groupby('channel', observed=True).agg({
         'amount': ['sum', 'mean', 'count']
     }).reset_index()
     
     channel_metrics.columns = ['channel', 'total_revenue', 'avg_order_value', 'order_count']
     
-    fig = make_subplots(
-        rows=1, cols=3,
-        subplot_titles=('Total Revenue', 'Average Order Value', 'Order Count'),
-        specs=[[{'type': 'bar'}, {'type': 'bar'}, {'type': 'bar'}]]
-    )
-    
     colors = {'web': '#0066cc', 'app': '#28a745', 'store': '#FFC107'}
     
-    for channel in channel_metrics['channel'].unique():
-        channel_data = channel_metrics[channel_metrics['channel'] == channel]
-        color = colors.get(channel, '#999999')
-        
-        fig.add_trace(
-            go.Bar(
-                x=[channel],
-                y=channel_data['total_revenue'],
-                name=channel,
-                marker_color=color,
-                showlegend=False
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Bar(
-                x=[channel],
-                y=channel_data['avg_order_value'],
-                name=channel,
-                marker_color=color,
-                showlegend=False
-            ),
-            row=1, col=2
-        )
-        
-        fig.add_trace(
-            go.Bar(
-                x=[channel],
-                y=channel_data['order_count'],
-                name=channel,
-                marker_color=color,
-                showlegend=True
-            ),
-            row=1, col=3
-        )
+    fig = _faceted_metric_bars(
+        channel_metrics, 'channel',
+        {
+            'total_revenue': ('Total Revenue', 'Revenue (₹)'),
+            'avg_order_value': ('Average Order Value', 'Avg Value (₹)'),
+            'order_count': ('Order Count', 'Orders'),
+        },
+        color_discrete_map=colors
+    )
     
     fig.update_layout(
         title_text='Channel Performance Analysis',
@@ -721,10 +1166,6 @@ def create_channel_performance_chart(
         showlegend=True
     )
     
-    fig.update_yaxes(title_text="Revenue (₹)", row=1, col=1)
-    fig.update_yaxes(title_text="Avg Value (₹)", row=1, col=2)
-    fig.update_yaxes(title_text="Orders", row=1, col=3)
-    
     return fig
 
 
@@ -740,13 +1181,18 @@ def create_acquisition_funnel_chart(
     Returns:
         Plotly Figure object
     """
+    go = _go()
     total = len(customers_df)
-    new_customers = customers_df[customers_df['segment'] == 'new'].shape[0]
-    returning = customers_df[customers_df['segment'] == 'returning'].shape[0]
-    vip = customers_df[customers_df['segment'] == 'vip'].shape[0]
+    segment_counts = customers_df['segment'].value_counts()
+    new_customers = int(segment_counts.get('new', 0))
+    returning = int(segment_counts.get('returning', 0))
+    vip = int(segment_counts.get('vip', 0))
     
     # Calculate engagement levels
-    high_engagement = customers_df[customers_df.get('engagement_score', 0) > 70].shape[0]
+    if 'engagement_score' in customers_df.columns:
+        high_engagement = int((customers_df['engagement_score'].to_numpy() > 70).sum())
+    else:
+        high_engagement = 0
     
     fig = go.Figure(go.Funnel(
         y=['Total Customers', 'New Customers', 'Returning Customers', 'VIP Customers', 'High Engagement'],
@@ -780,6 +1226,8 @@ def create_product_category_trends(
     Returns:
         Plotly Figure object
     """
+    go = _go()
+    px = _px()
     if 'product_category' not in orders_df.columns:
         fig = go.Figure()
         fig.add_annotation(
@@ -789,26 +1237,20 @@ def create_product_category_trends(
         )
         return fig
     
-    orders_copy = orders_df.copy()
-    orders_copy['order_date'] = pd.to_datetime(orders_copy['order_date'])
-    orders_copy['month'] = orders_copy['order_date'].dt.to_period('M')
+    months = _order_dates(orders_df).dt.to_period('M').rename('month')
     
-    category_trends = orders_copy.groupby(['month', 'product_category'])['amount'].sum().reset_index()
+    category_trends = (
+        orders_df['amount'].groupby([months, orders_df['product_category']]).sum().reset_index()
+    )
     category_trends['month_str'] = category_trends['month'].astype(str)
     
-    fig = go.Figure()
+    category_trends['product_category'] = category_trends['product_category'].str.title()
     
-    colors = px.colors.qualitative.Set2
-    for i, category in enumerate(category_trends['product_category'].unique()):
-        cat_data = category_trends[category_trends['product_category'] == category]
-        fig.add_trace(go.Scatter(
-            x=cat_data['month_str'],
-            y=cat_data['amount'],
-            mode='lines+markers',
-            name=category.title(),
-            line=dict(width=2, color=colors[i % len(colors)]),
-            marker=dict(size=6)
-        ))
+    fig = px.line(
+        category_trends, x='month_str', y='amount', color='product_category',
+        markers=True, color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    fig.update_traces(line_width=2, marker_size=6)
     
     fig.update_layout(
         title='Product Category Revenue Trends Over Time',
@@ -816,7 +1258,7 @@ def create_product_category_trends(
         yaxis_title='Revenue (₹)',
         height=500,
         hovermode='x unified',
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1, title_text='')
     )
     
     return fig
@@ -834,6 +1276,8 @@ def create_response_rate_analysis(
     Returns:
         Plotly Figure object
     """
+    go = _go()
+    make_subplots = _make_subplots()
     if 'response_rate' not in customers_df.columns:
         fig = go.Figure()
         fig.add_annotation(
@@ -844,7 +1288,7 @@ def create_response_rate_analysis(
         return fig
     
     # Response rate by segment
-    segment_response = customers_df.groupby('segment')['response_rate'].mean().reset_index()
+    segment_response = customers_df.groupby('segment', observed=True)['response_rate'].mean().reset_index()
     segment_response['response_rate_pct'] = segment_response['response_rate'] * 100
     
     fig = make_subplots(
@@ -853,43 +1297,43 @@ def create_response_rate_analysis(
         specs=[[{'type': 'bar'}, {'type': 'box'}]]
     )
     
-    colors = {'new': '#4CAF50', 'returning': '#2196F3', 
-              'vip': '#FFC107', 'at_risk': '#F44336'}
-    
-    for segment in segment_response['segment']:
-        seg_data = segment_response[segment_response['segment'] == segment]
-        fig.add_trace(
-            go.Bar(
-                x=[segment],
-                y=seg_data['response_rate_pct'],
-                name=segment,
-                marker_color=colors.get(segment, '#999999'),
-                showlegend=False
-            ),
-            row=1, col=1
+    response_pct = customers_df['response_rate'].to_numpy() * 100
+    segment_rows = customers_df.groupby('segment', sort=False, observed=True).indices
+    
+    # Build every trace up front and add them in a single validation pass
+    bars = [
+        go.Bar(
+            x=[segment],
+            y=[pct],
+            name=segment,
+            marker_color=_SEGMENT_COLORS.get(segment, '#999999'),
+            showlegend=False
         )
-    
+        for segment, pct in zip(segment_response['segment'], segment_response['response_rate_pct'])
+    ]
     # Box plot for distribution
-    for segment in customers_df['segment'].unique():
-        seg_customers = customers_df[customers_df['segment'] == segment]
-        fig.add_trace(
-            go.Box(
-                y=seg_customers['response_rate'] * 100,
-                name=segment,
-                marker_color=colors.get(segment, '#999999')
-            ),
-            row=1, col=2
+    boxes = [
+        go.Box(
+            y=response_pct[idx],
+            name=segment,
+            marker_color=_SEGMENT_COLORS.get(segment, '#999999')
         )
+        for segment, idx in segment_rows.items()
+    ]
+    fig.add_traces(
+        bars + boxes,
+        rows=[1] * (len(bars) + len(boxes)),
+        cols=[1] * len(bars) + [2] * len(boxes)
+    )
     
     fig.update_layout(
         title_text='Customer Response Rate Analysis',
         height=400,
-        showlegend=False
+        showlegend=False,
+        yaxis_title_text='Response Rate (%)',
+        yaxis2_title_text='Response Rate (%)'
     )
     
-    fig.update_yaxes(title_text="Response Rate (%)", row=1, col=1)
-    fig.update_yaxes(title_text="Response Rate (%)", row=1, col=2)
-    
     return fig
 
 
@@ -907,6 +1351,8 @@ def create_buying_behavior_chart(
     Returns:
         Plotly Figure object
     """
+    go = _go()
+    px = _px()
     if 'buying_behavior' not in customers_df.columns:
         fig = go.Figure()
         fig.add_annotation(
@@ -916,64 +1362,31 @@ def create_buying_behavior_chart(
         )
         return fig
     
-    behavior_metrics = []
-    
-    for behavior in customers_df['buying_behavior'].unique():
-        behav_customers = customers_df[customers_df['buying_behavior'] == behavior]
-        behav_orders = orders_df[orders_df['customer_id'].isin(behav_customers['customer_id'])]
-        
-        metrics = {
-            'behavior': behavior,
-            'customer_count': len(behav_customers),
-            'total_revenue': behav_orders['amount'].sum(),
-            'avg_order_value': behav_orders['amount'].mean() if len(behav_orders) > 0 else 0
-        }
-        behavior_metrics.append(metrics)
-    
-    metrics_df = pd.DataFrame(behavior_metrics)
-    
-    fig = make_subplots(
-        rows=1, cols=3,
-        subplot_titles=('Customer Count', 'Total Revenue', 'Avg Order Value'),
-        specs=[[{'type': 'bar'}, {'type': 'bar'}, {'type': 'bar'}]]
+    # One join + groupby rather than a boolean mask and isin() per behavior
+    order_behaviors = orders_df[['customer_id', 'amount']].merge(
+        customers_df[['customer_id', 'buying_behavior']], on='customer_id', how='inner'
+    )
+    order_stats = order_behaviors.groupby('buying_behavior', observed=True)['amount'].agg(
+        total_revenue='sum', avg_order_value='mean'
     )
     
-    colors = px.colors.qualitative.Set3
+    metrics_df = (
+        customers_df.groupby('buying_behavior', sort=False, observed=True).size()
+        .rename('customer_count').to_frame()
+        .join(order_stats)
+        .fillna({'total_revenue': 0, 'avg_order_value': 0})
+        .rename_axis('behavior').reset_index()
+    )
     
-    for i, behavior in enumerate(metrics_df['behavior']):
-        behav_data = metrics_df[metrics_df['behavior'] == behavior]
-        color = colors[i % len(colors)]
-        
-        fig.add_trace(
-            go.Bar(
-                x=[behavior],
-                y=behav_data['customer_count'],
-                marker_color=color,
-                showlegend=False
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Bar(
-                x=[behavior],
-                y=behav_data['total_revenue'],
-                marker_color=color,
-                showlegend=False
-            ),
-            row=1, col=2
-        )
-        
-        fig.add_trace(
-            go.Bar(
-                x=[behavior],
-                y=behav_data['avg_order_value'],
-                marker_color=color,
-                showlegend=True,
-                name=behavior
-            ),
-            row=1, col=3
-        )
+    fig = _faceted_metric_bars(
+        metrics_df, 'behavior',
+        {
+            'customer_count': ('Customer Count', 'Count'),
+            'total_revenue': ('Total Revenue', 'Revenue (₹)'),
+            'avg_order_value': ('Avg Order Value', 'Avg Value (₹)'),
+        },
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
     
     fig.update_layout(
         title_text='Performance by Buying Behavior',
@@ -981,9 +1394,5 @@ def create_buying_behavior_chart(
         showlegend=True
     )
     
-    fig.update_yaxes(title_text="Count", row=1, col=1)
-    fig.update_yaxes(title_text="Revenue (₹)", row=1, col=2)
-    fig.update_yaxes(title_text="Avg Value (₹)", row=1, col=3)
-    
     return fig
 
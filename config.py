@@ -18,11 +18,21 @@ OUTPUT_DIR = BASE_DIR / os.getenv("OUTPUT_DIR", "media/output")
 DATA_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Byte budget of each on-disk media cache under OUTPUT_DIR (Veo videos, report
+# videos, gTTS audio); least recently used entries are evicted past it
+MEDIA_CACHE_MAX_BYTES = int(os.getenv("MEDIA_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
 # API Keys (optional)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 APPS_SCRIPT_WEBHOOK_URL = os.getenv("APPS_SCRIPT_WEBHOOK_URL", "")
 VEO3_API_URL = os.getenv("VEO3_API_URL", "")  # Veo3 video generation API endpoint
+# gzip webhook request bodies; only for endpoints that decode Content-Encoding
+# (a plain Apps Script doPost does not)
+WEBHOOK_GZIP = os.getenv("WEBHOOK_GZIP", "0").lower() in ("1", "true", "yes")
+# Opt-in: skip re-sending an identical report to the same recipient within
+# this many seconds (0, the default, always sends)
+WEBHOOK_DEDUPE_SECONDS = int(os.getenv("WEBHOOK_DEDUPE_SECONDS", "0"))
 
 # Data generation settings
 RANDOM_SEED = 42
@@ -71,7 +81,25 @@ CONTACT_TIMES = ["morning", "afternoon", "evening", "weekend"]
 # Video settings
 VIDEO_RESOLUTION = (1280, 720)
 VIDEO_FPS = 24
+# Rate at which MoviePy renders slideshow frames. Sections are still images,
+# so only a couple of frames per second need compositing; ffmpeg repeats
+# them to VIDEO_FPS in the output stream.
+SLIDESHOW_FPS = 2
 VIDEO_DURATION_RANGE = (15, 30)
+# libx264 preset for report encodes; report videos are still images plus
+# narration, so a fast preset costs little size. Use "medium"/"slow" for quality.
+VIDEO_PRESET = os.getenv("VIDEO_PRESET", "veryfast")
+# H.264 encoder: "auto" uses a working hardware encoder (NVENC, Quick Sync,
+# VideoToolbox) when present, else libx264; or name an ffmpeg encoder
+VIDEO_ENCODER = os.getenv("VIDEO_ENCODER", "auto")
+
+# Chart rendering: "plotly" saves Plotly figures through Kaleido, "static"
+# renders saved copies with matplotlib (no browser process; for emailed reports)
+RENDER_BACKEND = os.getenv("RENDER_BACKEND", "plotly")
+
+# On-disk format for generated data: "parquet" (needs pyarrow; keeps dtypes
+# and list columns) or "csv". Parquet falls back to CSV without pyarrow.
+DATA_FORMAT = os.getenv("DATA_FORMAT", "parquet")
 
 # TTS settings
 TTS_ENGINE = "pyttsx3"  # or "gtts"
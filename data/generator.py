@@ -2,31 +2,121 @@
 Synthetic data generator for customers and orders using Faker.
 Creates deterministic, realistic business data for BI analysis.
 """
-import random
-from datetime import date, timedelta
-from typing import List, Tuple
+import ast
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
-from faker import Faker
 
 import config
 from data.schema import Customer, Order
 
+# Optional Parquet support
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Domains used for synthetic customer emails (reserved for examples)
+_EMAIL_DOMAINS = ["example.com", "example.org", "example.net"]
+
+# Order amount range (low, high) per segment
+_SEGMENT_AMOUNT_RANGES = {
+    "new": (500, 3000),
+    "returning": (2000, 8000),
+    "vip": (5000, 20000),
+    "at_risk": (300, 2000),
+}
+
+
+def _sample_subsets(
+    rng: np.random.Generator,
+    pool: List[str],
+    counts: np.ndarray
+) -> Tuple[np.ndarray, List[List[str]]]:
+    """
+    Draw a random subset of ``pool`` per row without replacement.
+    
+    Args:
+        rng: NumPy random generator
+        pool: Values to sample from
+        counts: Subset size per row
+    
+    Returns:
+        Tuple of (per-row shuffled pool indices, per-row subsets). Row i's
+        subset is the first counts[i] entries of its shuffled indices.
+    """
+    # Shuffle each row of pool indices in C instead of argsorting random keys
+    order = rng.permuted(np.tile(np.arange(len(pool)), (len(counts), 1)), axis=1)
+    pool_arr = np.asarray(pool, dtype=object)
+    subsets = [pool_arr[row[:k]].tolist() for row, k in zip(order, counts)]
+    return order, subsets
+
+
+def _random_categorical(rng: np.random.Generator, categories: List[str], size: int) -> pd.Categorical:
+    """Uniformly sample ``size`` values of ``categories`` as a Categorical."""
+    codes = rng.integers(0, len(categories), size=size, dtype=np.int8)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _format_ids(prefix: str, count: int, width: int) -> np.ndarray:
+    """Build ``count`` zero-padded IDs (e.g. ``CUST0001``) with NumPy string ops."""
+    return np.char.add(prefix, np.char.zfill(np.arange(1, count + 1).astype(str), width))
+
+
+def _weighted_pool(table: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a Faker weighted name table into values and probabilities."""
+    weights = np.fromiter(table.values(), dtype=np.float64, count=len(table))
+    return np.asarray(list(table), dtype=object), weights / weights.sum()
+
+
+def _random_contacts(rng: np.random.Generator, size: int) -> Tuple[List[str], List[str]]:
+    """
+    Draw realistic customer names and matching unique emails.
+    
+    Samples Faker's weighted en_US first/last name tables directly with
+    NumPy instead of calling fake.name()/fake.email() per customer.
+    
+    Args:
+        rng: NumPy random generator
+        size: Number of customers
+    
+    Returns:
+        Tuple of (names, emails)
+    """
+    from faker.providers.person.en_US import Provider as PersonProvider
+    
+    first_pool, first_p = _weighted_pool(PersonProvider.first_names)
+    last_pool, last_p = _weighted_pool(PersonProvider.last_names)
+    first = first_pool[rng.choice(len(first_pool), size=size, p=first_p)]
+    last = last_pool[rng.choice(len(last_pool), size=size, p=last_p)]
+    domains = rng.choice(_EMAIL_DOMAINS, size=size)
+    
+    names = [f"{given} {family}" for given, family in zip(first, last)]
+    # The customer number keeps emails unique across repeated names
+    emails = [
+        f"{given.lower()}.{family.lower()}{i}@{domain}"
+        for i, (given, family, domain) in enumerate(zip(first, last, domains), start=1)
+    ]
+    return names, emails
+
 
 def generate_synthetic_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Generate synthetic customer and order data.
     
+    Columns are drawn as whole NumPy arrays rather than row by row; one
+    sample customer and order are validated against the Pydantic schema.
+    
     Returns:
         Tuple of (customers_df, orders_df)
     """
     # Set random seed for reproducibility
-    random.seed(config.RANDOM_SEED)
-    fake = Faker()
-    Faker.seed(config.RANDOM_SEED)
-    
-    customers = []
-    orders = []
-    order_counter = 1
+    rng = np.random.default_rng(config.RANDOM_SEED)
     
     # Calculate segment counts
     segment_counts = {
@@ -38,115 +128,188 @@ def generate_synthetic_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     if diff > 0:
         segment_counts["returning"] += diff
     
-    # Generate customers by segment
-    customer_id = 1
-    for segment, count in segment_counts.items():
-        for _ in range(count):
-            cust_id = f"CUST{customer_id:04d}"
-            
-            # Generate customer data
-            created_days_ago = random.randint(90, 365)
-            created_at = date.today() - timedelta(days=created_days_ago)
-            last_contact_days_ago = random.randint(0, 30)
-            last_contact = date.today() - timedelta(days=last_contact_days_ago)
-            
-            # Random interests (2-4 from pool)
-            num_interests = random.randint(2, 4)
-            interests = random.sample(config.INTEREST_POOL, num_interests)
-            
-            # New personalization fields
-            engagement_score = random.randint(20, 100)
-            preferred_contact_time = random.choice(config.CONTACT_TIMES)
-            num_pain_points = random.randint(1, 3)
-            pain_points = random.sample(config.PAIN_POINTS_POOL, num_pain_points)
-            buying_behavior = random.choice(config.BUYING_BEHAVIORS)
-            response_rate = round(random.uniform(0.1, 0.9), 2)
-            
-            customer = Customer(
-                customer_id=cust_id,
-                name=fake.name(),
-                email=fake.email(),
-                segment=segment,
-                interests=interests,
-                last_contact_date=last_contact,
-                created_at=created_at,
-                engagement_score=engagement_score,
-                preferred_contact_time=preferred_contact_time,
-                pain_points=pain_points,
-                buying_behavior=buying_behavior,
-                response_rate=response_rate,
-                lifetime_value=None  # Will be calculated after orders
-            )
-            customers.append(customer.model_dump())
-            
-            # Generate orders for this customer
-            num_orders = random.randint(
-                config.ORDERS_PER_CUSTOMER_MIN,
-                config.ORDERS_PER_CUSTOMER_MAX
-            )
-            
-            for _ in range(num_orders):
-                order_id = f"ORD{order_counter:08d}"
-                order_counter += 1
-                
-                # Order date within last DATA_DAYS_BACK days
-                days_ago = random.randint(0, config.DATA_DAYS_BACK)
-                order_date = date.today() - timedelta(days=days_ago)
-                
-                # Amount varies by segment
-                if segment == "vip":
-                    amount = random.uniform(5000, 20000)
-                elif segment == "returning":
-                    amount = random.uniform(2000, 8000)
-                elif segment == "new":
-                    amount = random.uniform(500, 3000)
-                else:  # at_risk
-                    amount = random.uniform(300, 2000)
-                
-                # Category based on interests
-                if interests:
-                    category = random.choice(interests)
-                else:
-                    category = random.choice(config.PRODUCT_CATEGORIES)
-                
-                channel = random.choice(config.ORDER_CHANNELS)
-                
-                order = Order(
-                    order_id=order_id,
-                    customer_id=cust_id,
-                    order_date=order_date,
-                    amount=round(amount, 2),
-                    product_category=category,
-                    channel=channel
-                )
-                orders.append(order.model_dump())
-            
-            customer_id += 1
-    
-    # Convert to DataFrames
-    customers_df = pd.DataFrame(customers)
-    orders_df = pd.DataFrame(orders)
+    # Customers, grouped by segment as before. Every column is an aligned
+    # array handed to the DataFrame constructor without a copy; categorical
+    # columns are sampled as int8 codes and never materialised as strings.
+    segment_code = np.repeat(
+        np.array([config.SEGMENTS.index(seg) for seg in segment_counts], dtype=np.int8),
+        list(segment_counts.values())
+    )
+    n_customers = len(segment_code)
+    cust_ids = _format_ids("CUST", n_customers, 4)
+    today = np.datetime64(date.today(), 'D')
+    
+    created_at = today - rng.integers(90, 366, size=n_customers).astype('timedelta64[D]')
+    last_contact = today - rng.integers(0, 31, size=n_customers).astype('timedelta64[D]')
+    
+    # Random interests (2-4 from pool)
+    num_interests = rng.integers(2, 5, size=n_customers)
+    interest_order, interests = _sample_subsets(rng, config.INTEREST_POOL, num_interests)
+    _, pain_points = _sample_subsets(
+        rng, config.PAIN_POINTS_POOL, rng.integers(1, 4, size=n_customers)
+    )
+    
+    names, emails = _random_contacts(rng, n_customers)
+    
+    customers_df = pd.DataFrame({
+        'customer_id': cust_ids,
+        'name': names,
+        'email': emails,
+        'segment': pd.Categorical.from_codes(segment_code, categories=config.SEGMENTS),
+        'interests': interests,
+        'last_contact_date': pd.Series(last_contact).dt.date,
+        'created_at': pd.Series(created_at).dt.date,
+        'engagement_score': rng.integers(20, 101, size=n_customers),
+        'preferred_contact_time': rng.choice(config.CONTACT_TIMES, size=n_customers),
+        'pain_points': pain_points,
+        'buying_behavior': _random_categorical(rng, config.BUYING_BEHAVIORS, n_customers),
+        'response_rate': rng.uniform(0.1, 0.9, size=n_customers).round(2),
+    }, copy=False)
+    
+    # Orders: expand each customer index by its order count
+    num_orders = rng.integers(
+        config.ORDERS_PER_CUSTOMER_MIN,
+        config.ORDERS_PER_CUSTOMER_MAX + 1,
+        size=n_customers
+    )
+    customer_idx = np.repeat(np.arange(n_customers), num_orders)
+    n_orders = len(customer_idx)
+    
+    # Amount varies by segment
+    bounds = np.array([_SEGMENT_AMOUNT_RANGES[seg] for seg in config.SEGMENTS], dtype=np.float64)
+    low, high = bounds[segment_code[customer_idx]].T
+    amounts = rng.uniform(low, high).round(2)
+    
+    # Category is one of the customer's own interests
+    pick = (rng.random(n_orders) * num_interests[customer_idx]).astype(np.intp)
+    category_idx = interest_order[customer_idx, pick]
+    
+    order_dates = today - rng.integers(
+        0, config.DATA_DAYS_BACK + 1, size=n_orders
+    ).astype('timedelta64[D]')
+    
+    orders_df = pd.DataFrame({
+        'order_id': _format_ids("ORD", n_orders, 8),
+        'customer_id': cust_ids[customer_idx],
+        'order_date': pd.Series(order_dates).dt.date,
+        'amount': amounts,
+        'product_category': np.asarray(config.INTEREST_POOL)[category_idx],
+        'channel': _random_categorical(rng, config.ORDER_CHANNELS, n_orders),
+    }, copy=False)
     
     # Calculate lifetime value for each customer
-    customer_totals = orders_df.groupby('customer_id')['amount'].sum()
-    customers_df['lifetime_value'] = customers_df['customer_id'].map(customer_totals).fillna(0)
+    customers_df['lifetime_value'] = np.bincount(
+        customer_idx, weights=amounts, minlength=n_customers
+    )
+    
+    # The columns are built to satisfy the schema; check one row of each
+    Customer.model_validate(customers_df.iloc[0].to_dict())
+    Order.model_validate(orders_df.iloc[0].to_dict())
+    
+    return categorize_columns(customers_df, orders_df)
+
+
+def _as_categorical(series: pd.Series, canonical: List[str]) -> pd.Series:
+    """
+    Convert a low-cardinality string column to categorical dtype.
+    
+    Categories follow the canonical config order so groupby results come
+    out in a fixed order; values outside it (e.g. from uploaded files) are
+    appended rather than dropped.
+    """
+    extra = sorted(v for v in series.dropna().unique() if v not in canonical)
+    return series.astype(pd.CategoricalDtype(list(canonical) + extra))
+
+
+def categorize_columns(
+    customers_df: pd.DataFrame,
+    orders_df: pd.DataFrame
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Store segment, buying_behavior and channel as categoricals.
+    
+    Charts group by these columns repeatedly; integer category codes make
+    those groupbys cheaper than hashing strings and halve their memory.
+    
+    Args:
+        customers_df: Customer dataframe
+        orders_df: Orders dataframe
+    
+    Returns:
+        Tuple of (customers_df, orders_df)
+    """
+    if 'segment' in customers_df.columns:
+        customers_df['segment'] = _as_categorical(customers_df['segment'], config.SEGMENTS)
+    if 'buying_behavior' in customers_df.columns:
+        customers_df['buying_behavior'] = _as_categorical(
+            customers_df['buying_behavior'], config.BUYING_BEHAVIORS
+        )
+    if 'channel' in orders_df.columns:
+        orders_df['channel'] = _as_categorical(orders_df['channel'], config.ORDER_CHANNELS)
     
     return customers_df, orders_df
 
 
+# Customer columns holding lists of strings
+_LIST_COLUMNS = ('interests', 'pain_points')
+
+
+def _parse_list(value):
+    """
+    Parse a list column value read from CSV.
+    
+    Data saved by this module stores JSON arrays; uploaded files and CSVs
+    written by older versions hold Python list reprs, which still parse
+    through ast as a fallback. Non-string values pass through unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return ast.literal_eval(value)
+
+
+def _data_paths(fmt: str) -> Tuple[Path, Path]:
+    """Return the (customers, orders) file paths for a storage format."""
+    return config.DATA_DIR / f"customers.{fmt}", config.DATA_DIR / f"orders.{fmt}"
+
+
+def _storage_format() -> str:
+    """Configured storage format, falling back to CSV without pyarrow."""
+    if config.DATA_FORMAT == "parquet" and PYARROW_AVAILABLE:
+        return "parquet"
+    return "csv"
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write a CSV through a 1 MiB buffered handle in large row chunks."""
+    with open(path, 'w', buffering=1024 * 1024, newline='', encoding='utf-8') as f:
+        df.to_csv(f, index=False, chunksize=50_000, lineterminator='\n')
+
+
 def save_data(customers_df: pd.DataFrame, orders_df: pd.DataFrame) -> None:
     """
-    Save dataframes to CSV files.
+    Save dataframes to Parquet (or CSV, see config.DATA_FORMAT) files.
     
     Args:
         customers_df: Customer dataframe
         orders_df: Orders dataframe
     """
-    customers_path = config.DATA_DIR / "customers.csv"
-    orders_path = config.DATA_DIR / "orders.csv"
+    fmt = _storage_format()
+    customers_path, orders_path = _data_paths(fmt)
     
-    customers_df.to_csv(customers_path, index=False)
-    orders_df.to_csv(orders_path, index=False)
+    if fmt == "parquet":
+        customers_df.to_parquet(customers_path, engine='pyarrow', compression='zstd', index=False)
+        orders_df.to_parquet(orders_path, engine='pyarrow', compression='zstd', index=False)
+    else:
+        # List columns as JSON arrays, which load far faster than Python reprs
+        list_columns = {
+            col: customers_df[col].map(json.dumps)
+            for col in _LIST_COLUMNS if col in customers_df.columns
+        }
+        _write_csv(customers_df.assign(**list_columns), customers_path)
+        _write_csv(orders_df, orders_path)
     
     print(f"✓ Saved {len(customers_df)} customers to {customers_path}")
     print(f"✓ Saved {len(orders_df)} orders to {orders_path}")
@@ -154,13 +317,27 @@ def save_data(customers_df: pd.DataFrame, orders_df: pd.DataFrame) -> None:
 
 def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Load customer and order data from CSV files.
+    Load customer and order data from Parquet or CSV files.
+    
+    Parquet files keep dates, categoricals and list columns as written, so
+    they need no parsing. CSV files are used when Parquet is disabled or
+    unavailable, or when only CSV data exists.
     
     Returns:
         Tuple of (customers_df, orders_df)
     """
-    customers_path = config.DATA_DIR / "customers.csv"
-    orders_path = config.DATA_DIR / "orders.csv"
+    if _storage_format() == "parquet":
+        customers_path, orders_path = _data_paths("parquet")
+        if customers_path.exists() and orders_path.exists():
+            customers_df = pd.read_parquet(customers_path, engine='pyarrow')
+            orders_df = pd.read_parquet(orders_path, engine='pyarrow')
+            # List columns come back as NumPy arrays; callers expect lists
+            for col in _LIST_COLUMNS:
+                if col in customers_df.columns:
+                    customers_df[col] = [values.tolist() for values in customers_df[col]]
+            return categorize_columns(customers_df, orders_df)
+    
+    customers_path, orders_path = _data_paths("csv")
     
     if not customers_path.exists() or not orders_path.exists():
         raise FileNotFoundError(
@@ -180,12 +357,11 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     orders_df['order_date'] = pd.to_datetime(orders_df['order_date']).dt.date
     
     # Parse interests and pain_points from string representation
-    import ast
-    customers_df['interests'] = customers_df['interests'].apply(ast.literal_eval)
-    if 'pain_points' in customers_df.columns:
-        customers_df['pain_points'] = customers_df['pain_points'].apply(ast.literal_eval)
+    for col in _LIST_COLUMNS:
+        if col in customers_df.columns:
+            customers_df[col] = [_parse_list(value) for value in customers_df[col].to_numpy()]
     
-    return customers_df, orders_df
+    return categorize_columns(customers_df, orders_df)
 
 
 def load_uploaded_data(customers_file, orders_file) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -212,17 +388,11 @@ def load_uploaded_data(customers_file, orders_file) -> Tuple[pd.DataFrame, pd.Da
     orders_df['order_date'] = pd.to_datetime(orders_df['order_date']).dt.date
     
     # Parse interests and pain_points from string representation
-    import ast
-    if 'interests' in customers_df.columns:
-        customers_df['interests'] = customers_df['interests'].apply(
-            lambda x: ast.literal_eval(x) if isinstance(x, str) else x
-        )
-    if 'pain_points' in customers_df.columns:
-        customers_df['pain_points'] = customers_df['pain_points'].apply(
-            lambda x: ast.literal_eval(x) if isinstance(x, str) else x
-        )
+    for col in _LIST_COLUMNS:
+        if col in customers_df.columns:
+            customers_df[col] = [_parse_list(value) for value in customers_df[col].to_numpy()]
     
-    return customers_df, orders_df
+    return categorize_columns(customers_df, orders_df)
 
 
 def create_example_dataset() -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -3,15 +3,33 @@ AI image generation module with OpenAI/Gemini support and PIL fallback.
 Creates cover images for video reports.
 """
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List
-from PIL import Image, ImageDraw, ImageFont
+from typing import TYPE_CHECKING, Optional, List
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw
 
 import config
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _openai_clients() -> tuple:
+    """
+    Create the OpenAI client and download session once per process.
+    
+    Both are thread-safe and keep their HTTP connections alive, so repeated
+    and concurrent generations reuse them instead of reconnecting.
+    """
+    from openai import OpenAI
+    import requests
+    
+    return OpenAI(api_key=config.OPENAI_API_KEY), requests.Session()
+
+
 def generate_image_openai(prompt: str, output_path: Path) -> bool:
     """
     Generate image using OpenAI DALL-E.
@@ -28,10 +46,7 @@ def generate_image_openai(prompt: str, output_path: Path) -> bool:
         return False
     
     try:
-        from openai import OpenAI
-        import requests
-        
-        client = OpenAI(api_key=config.OPENAI_API_KEY)
+        client, session = _openai_clients()
         
         response = client.images.generate(
             model="dall-e-3",
@@ -44,7 +59,7 @@ def generate_image_openai(prompt: str, output_path: Path) -> bool:
         image_url = response.data[0].url
         
         # Download and save image
-        img_response = requests.get(image_url)
+        img_response = session.get(image_url)
         img_response.raise_for_status()
         
         with open(output_path, 'wb') as f:
@@ -58,6 +73,32 @@ def generate_image_openai(prompt: str, output_path: Path) -> bool:
         return False
 
 
+def generate_images_openai_batch(
+    prompts: List[str],
+    output_paths: List[Path],
+    concurrency: int = 8
+) -> List[bool]:
+    """
+    Generate several images with OpenAI DALL-E concurrently.
+    
+    Each generation is dominated by waiting on the API and the download,
+    so up to ``concurrency`` requests are kept in flight on a thread pool.
+    
+    Args:
+        prompts: Text prompts for image generation
+        output_paths: Paths to save images, one per prompt
+        concurrency: Maximum number of requests in flight
+    
+    Returns:
+        Success flag per prompt, in input order
+    """
+    if not prompts:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts))) as pool:
+        return list(pool.map(generate_image_openai, prompts, output_paths))
+
+
 def generate_image_gemini(prompt: str, output_path: Path) -> bool:
     """
     Generate image using Google Gemini.
@@ -92,6 +133,85 @@ def generate_image_gemini(prompt: str, output_path: Path) -> bool:
         return False
 
 
+# Placeholder cover layout
+_PLACEHOLDER_SIZE = (1024, 1024)
+_PLACEHOLDER_TEXT_COLOR = 'white'
+_SEGMENT_COLORS = {
+    'new': '#4CAF50',
+    'returning': '#2196F3',
+    'vip': '#FFC107',
+    'at_risk': '#F44336'
+}
+
+
+_FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+_FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+@lru_cache(maxsize=None)
+def _font(path: str, size: int):
+    """Load a truetype font once per (path, size), falling back to PIL's default."""
+    from PIL import ImageFont
+    
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def load_font(size: int, bold: bool = False):
+    """
+    Return the shared DejaVu UI font at `size` points (cached).
+    
+    Args:
+        size: Font size in points
+        bold: Use the bold face
+    
+    Returns:
+        PIL font, or PIL's default font if DejaVu is not installed
+    """
+    return _font(_FONT_BOLD if bold else _FONT_REGULAR, size)
+
+
+def _draw_centered(draw: 'ImageDraw.ImageDraw', y: int, text: str, font) -> None:
+    """Draw a line of text horizontally centred on the placeholder."""
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    draw.text(((_PLACEHOLDER_SIZE[0] - text_width) / 2, y), text,
+              fill=_PLACEHOLDER_TEXT_COLOR, font=font)
+
+
+@lru_cache(maxsize=8)
+def _segment_template(segment: str) -> 'Image.Image':
+    """
+    Render the per-segment part of the placeholder: background, title,
+    segment label and decorative circles.
+    
+    Cached, so callers must copy() the result before drawing on it.
+    """
+    from PIL import Image, ImageDraw
+    
+    width, height = _PLACEHOLDER_SIZE
+    image = Image.new('RGB', _PLACEHOLDER_SIZE, _SEGMENT_COLORS.get(segment, '#999999'))
+    draw = ImageDraw.Draw(image)
+    
+    # Title
+    _draw_centered(draw, 300, "Business Intelligence", _font(_FONT_BOLD, 60))
+    
+    # Segment
+    _draw_centered(draw, 400, f"Segment: {segment.upper()}", _font(_FONT_REGULAR, 40))
+    
+    # Draw decorative circles
+    for i in range(5):
+        x = (i + 1) * width // 6
+        y = 700
+        radius = 30
+        draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
+                    fill='white', outline=_PLACEHOLDER_TEXT_COLOR, width=3)
+    
+    return image
+
+
 def create_placeholder_image(
     segment: str,
     interests: List[str],
@@ -100,6 +220,9 @@ def create_placeholder_image(
     """
     Create a placeholder image using PIL.
     
+    Only the interests line differs between customers of a segment, so it
+    is drawn onto a copy of the cached segment template.
+    
     Args:
         segment: Customer segment
         interests: List of customer interests
@@ -108,59 +231,14 @@ def create_placeholder_image(
     Returns:
         True if successful, False otherwise
     """
+    from PIL import ImageDraw
+    
     try:
-        # Segment colors
-        colors = {
-            'new': '#4CAF50',
-            'returning': '#2196F3',
-            'vip': '#FFC107',
-            'at_risk': '#F44336'
-        }
-        bg_color = colors.get(segment, '#999999')
-        
-        # Create image
-        width, height = 1024, 1024
-        image = Image.new('RGB', (width, height), bg_color)
+        image = _segment_template(segment).copy()
         draw = ImageDraw.Draw(image)
         
-        # Try to use a nice font, fall back to default
-        try:
-            font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 60)
-            font_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 40)
-            font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 30)
-        except:
-            font_large = ImageFont.load_default()
-            font_medium = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-        
-        # Draw text
-        text_color = 'white'
-        
-        # Title
-        title = "Business Intelligence"
-        bbox = draw.textbbox((0, 0), title, font=font_large)
-        title_width = bbox[2] - bbox[0]
-        draw.text(((width - title_width) / 2, 300), title, fill=text_color, font=font_large)
-        
-        # Segment
-        segment_text = f"Segment: {segment.upper()}"
-        bbox = draw.textbbox((0, 0), segment_text, font=font_medium)
-        segment_width = bbox[2] - bbox[0]
-        draw.text(((width - segment_width) / 2, 400), segment_text, fill=text_color, font=font_medium)
-        
         # Interests
-        interests_text = f"Interests: {', '.join(interests[:3])}"
-        bbox = draw.textbbox((0, 0), interests_text, font=font_small)
-        interests_width = bbox[2] - bbox[0]
-        draw.text(((width - interests_width) / 2, 500), interests_text, fill=text_color, font=font_small)
-        
-        # Draw decorative circles
-        for i in range(5):
-            x = (i + 1) * width // 6
-            y = 700
-            radius = 30
-            draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
-                        fill='white', outline=text_color, width=3)
+        _draw_centered(draw, 500, f"Interests: {', '.join(interests[:3])}", _font(_FONT_REGULAR, 30))
         
         # Save image
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,99 @@
+"""
+Size-bounded eviction for the on-disk media caches.
+
+The caches under OUTPUT_DIR (Veo videos, encoded report videos, gTTS
+narrations) would otherwise only grow. Each cache calls `evict` after
+storing an entry, which deletes the least recently used entries until the
+directory fits its byte budget; hits call `touch`, so recency follows use
+rather than creation.
+"""
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def touch(path: Path) -> None:
+    """Mark a cache file as just used (its mtime orders eviction)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict(directory: Path, max_bytes: Optional[int] = None) -> int:
+    """
+    Delete least recently used entries until `directory` fits `max_bytes`.
+    
+    Files sharing a stem (e.g. a video and its .json metadata) form one
+    entry, ordered by its newest mtime. In-flight '.tmp' files are left
+    alone. Failures are logged and otherwise ignored.
+    
+    Args:
+        directory: Cache directory
+        max_bytes: Byte budget (defaults to config.MEDIA_CACHE_MAX_BYTES)
+    
+    Returns:
+        Number of bytes freed
+    """
+    budget = config.MEDIA_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries: Dict[str, List[os.DirEntry]] = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    entries.setdefault(entry.name.split('.', 1)[0], []).append(entry)
+    except OSError:
+        return 0
+    
+    sized = []
+    total = 0
+    for files in entries.values():
+        try:
+            stats = [f.stat() for f in files]
+        except OSError:
+            continue
+        size = sum(st.st_size for st in stats)
+        total += size
+        sized.append((max(st.st_mtime_ns for st in stats), size, files))
+    if total <= budget:
+        return 0
+    
+    freed = 0
+    for _, size, files in sorted(sized, key=lambda item: item[0]):
+        if total - freed <= budget:
+            break
+        try:
+            for f in files:
+                os.unlink(f.path)
+            freed += size
+        except OSError as e:
+            logger.debug("Could not evict %s: %s", files[0].path, e)
+    logger.info("Evicted %d bytes from cache %s", freed, directory)
+    return freed
+
+
+def remove_unreferenced(directory: Path) -> int:
+    """
+    Delete files in a hardlink content store that no other path links to.
+    
+    Returns:
+        Number of files removed
+    """
+    removed = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_file() and entry.stat().st_nlink == 1:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return removed
@@ -4,12 +4,32 @@ Integrates Gemini Veo API for AI-powered video creation from text prompts.
 """
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List
 import time
 
 logger = logging.getLogger(__name__)
 
+# Map segments to visual themes
+_SEGMENT_THEMES = MappingProxyType({
+    'vip': 'luxurious, premium, gold accents, elegant',
+    'returning': 'welcoming, friendly, blue tones, professional',
+    'new': 'exciting, vibrant, green and bright colors, energetic',
+    'at_risk': 'warm, inviting, comeback theme, purple and orange'
+})
+_DEFAULT_THEME = 'professional, modern'
+
+# Map segments to video mood/tone
+_SEGMENT_MOODS = MappingProxyType({
+    'vip': 'exclusive, prestigious, reward-focused',
+    'returning': 'appreciative, loyal, value-reinforcing',
+    'new': 'welcoming, exciting, opportunity-focused',
+    'at_risk': 'understanding, special offer, win-back focused'
+})
+_DEFAULT_MOOD = 'professional, engaging'
+
 
 def is_gemini_veo_available() -> bool:
     """
@@ -42,15 +62,7 @@ def generate_sales_pitch_video_prompt(
     Returns:
         Formatted video prompt string
     """
-    # Map segments to visual themes
-    segment_themes = {
-        'vip': 'luxurious, premium, gold accents, elegant',
-        'returning': 'welcoming, friendly, blue tones, professional',
-        'new': 'exciting, vibrant, green and bright colors, energetic',
-        'at_risk': 'warm, inviting, comeback theme, purple and orange'
-    }
-    
-    theme = segment_themes.get(segment, 'professional, modern')
+    theme = _SEGMENT_THEMES.get(segment, _DEFAULT_THEME)
     
     # Create engaging prompt
     prompt = f"""
@@ -85,13 +97,24 @@ Make it visually appealing, professional, and designed to convert!
 
 def get_mood_for_segment(segment: str) -> str:
     """Get appropriate mood/tone for video based on segment."""
-    moods = {
-        'vip': 'exclusive, prestigious, reward-focused',
-        'returning': 'appreciative, loyal, value-reinforcing',
-        'new': 'welcoming, exciting, opportunity-focused',
-        'at_risk': 'understanding, special offer, win-back focused'
-    }
-    return moods.get(segment, 'professional, engaging')
+    return _SEGMENT_MOODS.get(segment, _DEFAULT_MOOD)
+
+
+@lru_cache(maxsize=1)
+def _gemini_model(api_key: str):
+    """
+    Configure the Gemini SDK and build the model once per API key.
+    
+    Raises:
+        ImportError: If google-generativeai is not installed
+    """
+    # Import Google Generative AI SDK
+    import google.generativeai as genai
+    
+    # Configure API
+    genai.configure(api_key=api_key)
+    # Try to use Gemini Veo model (when available)
+    return genai.GenerativeModel('gemini-pro')  # Placeholder - will be gemini-veo when available
 
 
 def generate_video_with_gemini_veo(
@@ -123,12 +146,7 @@ def generate_video_with_gemini_veo(
         return None
     
     try:
-        # Import Google Generative AI SDK
-        import google.generativeai as genai
-        
-        # Configure API
-        api_key = os.getenv('GOOGLE_API_KEY')
-        genai.configure(api_key=api_key)
+        model = _gemini_model(os.getenv('GOOGLE_API_KEY'))
         
         logger.info("Generating video with Gemini Veo...")
         logger.info(f"Prompt: {prompt[:100]}...")
@@ -138,9 +156,6 @@ def generate_video_with_gemini_veo(
         # This is a placeholder that demonstrates the intended flow
         
         try:
-            # Try to use Gemini Veo model (when available)
-            model = genai.GenerativeModel('gemini-pro')  # Placeholder - will be gemini-veo when available
-            
             # Enhanced prompt with video parameters
             full_prompt = f"""
             Generate a video with these specifications:
@@ -178,9 +193,7 @@ def generate_video_with_gemini_veo(
         logger.error("google-generativeai package not installed")
         return None
     except Exception as e:
-        logger.error(f"Error generating video with Gemini Veo: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error generating video with Gemini Veo: {e}")
         return None
 
 
@@ -244,6 +257,52 @@ def generate_sales_pitch_video(
     return None
 
 
+def generate_sales_pitch_videos_batch(
+    customers: List[Dict[str, Any]],
+    output_dir: Path
+) -> Dict[str, Optional[Path]]:
+    """
+    Generate sales pitch videos for many customers with one batch of Veo jobs.
+    
+    All prompts are submitted together and polled in a single loop, instead
+    of one blocking generate-and-poll round trip per customer.
+    
+    Args:
+        customers: Dicts with customer_id, name, segment, interests, kpis
+            and pitch_summary
+        output_dir: Base output directory; each video is written to
+            output_dir/{customer_id}/video/veo_output.mp4
+    
+    Returns:
+        Dictionary mapping customer_id to the video path, or None if failed
+    """
+    if not is_gemini_veo_available():
+        logger.warning("Gemini API key not configured")
+        return {c['customer_id']: None for c in customers}
+    
+    from media import veo3
+    
+    prompts = [
+        generate_sales_pitch_video_prompt(
+            c['name'], c['segment'], c.get('interests', []),
+            c.get('kpis', {}), c.get('pitch_summary', '')
+        )
+        for c in customers
+    ]
+    output_paths = [
+        output_dir / c['customer_id'] / 'video' / 'veo_output.mp4'
+        for c in customers
+    ]
+    
+    results = veo3.generate_videos_with_veo3_batch(
+        prompts,
+        output_paths,
+        api_key=os.getenv('GOOGLE_API_KEY'),
+        options={'aspect_ratio': '16:9', 'number_of_videos': 1}
+    )
+    return {c['customer_id']: path for c, path in zip(customers, results)}
+
+
 def get_gemini_veo_status() -> Dict[str, Any]:
     """
     Get status information about Gemini Veo availability.
@@ -16,45 +16,46 @@ try:
 except Exception:
     pass
 
-from google import genai
-from google.genai import types
-
-# Use GEMINI_API_KEY or GOOGLE_API_KEY
-API_KEY = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
-if not API_KEY:
-    raise SystemExit("No API key found in GEMINI_API_KEY or GOOGLE_API_KEY")
-
-# Initialize client with v1beta API version required for Veo
-client = genai.Client(
-    api_key=API_KEY,
-    http_options={'api_version': 'v1beta'}
-)
-
 MODEL = os.environ.get('VEO_MODEL') or 'veo-2.0-generate-001'
 
-video_config = types.GenerateVideosConfig(
-    aspect_ratio="16:9",
-    number_of_videos=1,
-    duration_seconds=8,
-)
-
 PROMPT = (
     "Short, professional 8s business presentation: clean slides with charts, "
     "display customer name and KPIs, modern transitions, subtle background music."
 )
 
 OUT = Path('media/output/CUST0001/video/veo_output.mp4')
-OUT.parent.mkdir(parents=True, exist_ok=True)
 
 def main():
+    # The SDK is only needed when the example actually runs
+    from google import genai
+    from google.genai import types
+
+    # Use GEMINI_API_KEY or GOOGLE_API_KEY
+    api_key = os.environ.get('GEMINI_API_KEY') or os.environ.get('GOOGLE_API_KEY')
+    if not api_key:
+        raise SystemExit("No API key found in GEMINI_API_KEY or GOOGLE_API_KEY")
+
+    # Initialize client with v1beta API version required for Veo
+    client = genai.Client(
+        api_key=api_key,
+        http_options={'api_version': 'v1beta'}
+    )
+
+    video_config = types.GenerateVideosConfig(
+        aspect_ratio="16:9",
+        number_of_videos=1,
+        duration_seconds=8,
+    )
+
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+
     print('Using model:', MODEL)
     op = client.models.generate_videos(model=MODEL, prompt=PROMPT, config=video_config)
     print('Operation started. Polling until done...')
 
-    start = time.time()
-    timeout = 60 * 10
+    deadline = time.monotonic() + 60 * 10
     while not getattr(op, 'done', False):
-        if time.time() - start > timeout:
+        if time.monotonic() >= deadline:
             raise RuntimeError('Video generation timed out')
         print('Polling operation status...')
         time.sleep(10)
@@ -2,6 +2,7 @@
 Test local MoviePy assembly using generated images and audio.
 Creates `media/output/CUST0001/video/local_fallback.mp4` if images exist.
 """
+import os
 import sys
 from pathlib import Path
 # add repo root to path
@@ -18,19 +19,18 @@ images = []
 for sub in ('images', 'charts'):
     p = base / sub
     if p.exists():
-        for f in sorted(p.iterdir()):
-            if f.suffix.lower() in ('.png', '.jpg', '.jpeg'):
-                images.append(f)
+        # scandir entries carry their type, so no extra stat() per file
+        with os.scandir(p) as it:
+            names = [e.name for e in it if e.is_file() and e.name.lower().endswith(('.png', '.jpg', '.jpeg'))]
+        images.extend(p / name for name in sorted(names))
 
 # Use existing audio if present
 audio = None
 audio_dir = base / 'audio'
 if audio_dir.exists():
     # pick first mp3/m4a
-    for f in audio_dir.iterdir():
-        if f.suffix.lower() in ('.mp3', '.m4a', '.wav'):
-            audio = f
-            break
+    with os.scandir(audio_dir) as it:
+        audio = next((Path(e.path) for e in it if e.name.lower().endswith(('.mp3', '.m4a', '.wav'))), None)
 
 print('Found images:', images)
 print('Found audio:', audio)
@@ -2,14 +2,27 @@
 Text-to-Speech module with pyttsx3 primary and gTTS fallback.
 Generates audio narration for customer summaries.
 """
+import hashlib
 import logging
+import os
+import shutil
+import threading
 from pathlib import Path
 from typing import Optional
 
 import config
+from media import disk_cache
 
 logger = logging.getLogger(__name__)
 
+# gTTS output is deterministic per (text, lang, slow), so narrations are memoized here
+TTS_CACHE_DIR = config.OUTPUT_DIR / '_tts_cache'
+
+# One pyttsx3 engine per process; engines are not thread-safe, so the lock
+# also serializes synthesis
+_PYTTSX_ENGINE = None
+_PYTTSX_LOCK = threading.Lock()
+
 
 def generate_audio_pyttsx3(text: str, output_path: Path) -> bool:
     """
@@ -22,15 +35,19 @@ def generate_audio_pyttsx3(text: str, output_path: Path) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    global _PYTTSX_ENGINE
+    
     try:
         import pyttsx3
         
-        engine = pyttsx3.init()
-        engine.setProperty('rate', config.TTS_RATE)
-        
-        # Save to file
-        engine.save_to_file(text, str(output_path))
-        engine.runAndWait()
+        with _PYTTSX_LOCK:
+            if _PYTTSX_ENGINE is None:
+                _PYTTSX_ENGINE = pyttsx3.init()
+                _PYTTSX_ENGINE.setProperty('rate', config.TTS_RATE)
+            
+            # Save to file
+            _PYTTSX_ENGINE.save_to_file(text, str(output_path))
+            _PYTTSX_ENGINE.runAndWait()
         
         logger.info(f"Audio generated with pyttsx3: {output_path}")
         return True
@@ -40,6 +57,19 @@ def generate_audio_pyttsx3(text: str, output_path: Path) -> bool:
         return False
 
 
+def _store_in_cache(audio_path: Path, cache_path: Path) -> None:
+    """Copy a fresh narration into the cache; a failed copy only costs a re-synthesis."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy under a temp name and rename, so readers never see a partial file
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        shutil.copyfile(audio_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache gTTS audio: {e}")
+    disk_cache.evict(TTS_CACHE_DIR)
+
+
 def generate_audio_gtts(text: str, output_path: Path) -> bool:
     """
     Generate audio using gTTS (requires internet).
@@ -51,6 +81,18 @@ def generate_audio_gtts(text: str, output_path: Path) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    key = hashlib.blake2b(text.encode() + b'|en|slow=0', digest_size=16).hexdigest()
+    cache_path = TTS_CACHE_DIR / f"{key}.mp3"
+    if cache_path.exists():
+        try:
+            shutil.copyfile(cache_path, output_path)
+            disk_cache.touch(cache_path)
+            logger.info(f"Audio reused from gTTS cache: {output_path}")
+            return True
+        except OSError as e:
+            # e.g. the entry was removed meanwhile; synthesize it again below
+            logger.warning(f"Could not reuse cached gTTS audio: {e}")
+    
     try:
         from gtts import gTTS
         
@@ -58,6 +100,7 @@ def generate_audio_gtts(text: str, output_path: Path) -> bool:
         tts.save(str(output_path))
         
         logger.info(f"Audio generated with gTTS: {output_path}")
+        _store_in_cache(output_path, cache_path)
         return True
         
     except Exception as e:
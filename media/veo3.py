@@ -33,26 +33,25 @@ from __future__ import annotations
 
 import time
 import logging
+import hashlib
 import json
+import os
+import random
+import re
+import shutil
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, Dict, Any
-
-import requests
+from typing import Optional, Dict, Any, List, Callable
 
 import config
+from media import disk_cache
+from media.veo_jobs import JobStore
 
 logger = logging.getLogger(__name__)
 
-# Optional Google GenAI (Veo) SDK support
-try:
-    from google import genai
-    from google.genai import types
-    GENAI_AVAILABLE = True
-except Exception:
-    genai = None
-    types = None
-    GENAI_AVAILABLE = False
-
 # Config keys:
 # - VEO3_API_URL: optional HTTP endpoint to submit video jobs
 # - GOOGLE_API_KEY: if you prefer to use a provider SDK instead, set this
@@ -61,8 +60,39 @@ if not VEO3_API_URL:
     VEO3_API_URL = getattr(config, 'VEO3_API_URL', None) or None
 
 # Polling defaults
-POLL_INTERVAL_SECONDS = 2
+# Start polling quickly so short jobs are picked up early; the jittered
+# backoff spreads out polls on long jobs
+POLL_INTERVAL_SECONDS = float(os.getenv('VEO_POLL_INTERVAL', '0.5'))
+POLL_BACKOFF_BASE = 3
+POLL_INTERVAL_MAX_SECONDS = 30
 POLL_MAX_SECONDS = 60 * 5  # 5 minutes default
+# Seconds the server may hold a status request open when a single job is left
+LONG_POLL_SECONDS = 30
+
+# (connect, read) timeouts in seconds for API calls and result downloads
+API_TIMEOUT = (5, 30)
+DOWNLOAD_TIMEOUT = (10, 300)
+
+_KEEPALIVE_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, 'TCP_KEEPIDLE'):
+    _KEEPALIVE_SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+    ]
+
+# Most Veo jobs a batch keeps in flight at once
+MAX_PARALLEL_JOBS = int(os.getenv('VEO3_MAX_PARALLEL', '5'))
+
+# Block size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Finished videos downloaded in parallel per batch
+DOWNLOAD_WORKERS = 8
+
+# Generated videos keyed by prompt hash, reused for repeat prompts
+VEO_CACHE_DIR = config.OUTPUT_DIR / '_veo_cache'
+VEO3_CACHE_ENABLED = os.getenv('VEO3_CACHE_ENABLED', '1').lower() not in ('0', 'false', 'no')
+# Cache entries keyed by content hash, hardlinked to dedupe identical files
+CONTENT_STORE_DIR = config.OUTPUT_DIR / '_content'
 
 
 class VEO3Client:
@@ -71,6 +101,7 @@ class VEO3Client:
     This client expects the API to expose these endpoints (common pattern):
       - POST {api_url}/jobs  => returns {"job_id": "..."}
       - GET  {api_url}/jobs/{job_id} => returns {"status": "pending|running|done|failed", "result_url": "https://..."}
+      - POST {api_url}/jobs:batch => body {"jobs": [...]}, returns {"job_ids": [...]} (optional)
 
     If your provider differs, adapt `submit_job` and `get_job_status`.
     """
@@ -78,6 +109,43 @@ class VEO3Client:
     def __init__(self, api_url: Optional[str] = None, api_key: Optional[str] = None):
         self.api_url = api_url or VEO3_API_URL
         self.api_key = api_key or config.GOOGLE_API_KEY
+        # One keep-alive session, so polling reuses the TCP/TLS connection
+        self._session = None
+        # Cleared once the server rejects `?wait=` long-poll requests
+        self.long_poll = True
+        # Cleared once the server turns out to lack `/jobs:batch`
+        self.batch_submit = True
+
+    def _http(self):
+        """Return the client's HTTP session, importing requests on first use.
+
+        The pool is sized for the parallel batch downloads, and idempotent
+        requests are retried with backoff on connection errors and on
+        429/5xx responses.
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.connection import HTTPConnection
+            from urllib3.util.retry import Retry
+
+            class KeepAliveAdapter(HTTPAdapter):
+                # TCP keepalive stops idle pooled connections from being
+                # dropped silently during the long waits between polls
+                def init_poolmanager(self, *args, **kwargs):
+                    kwargs['socket_options'] = HTTPConnection.default_socket_options + _KEEPALIVE_SOCKET_OPTIONS
+                    super().init_poolmanager(*args, **kwargs)
+
+            adapter = KeepAliveAdapter(
+                pool_connections=8,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
 
     def is_configured(self) -> bool:
         return bool(self.api_url or self.api_key)
@@ -85,13 +153,15 @@ class VEO3Client:
     def submit_job(self, payload: Dict[str, Any]) -> Optional[str]:
         """Submit a job and return job_id or None on failure."""
         if self.api_url:
+            import requests
+
             try:
                 headers = {"Content-Type": "application/json"}
                 if self.api_key:
                     # If the API expects a bearer token header
                     headers["Authorization"] = f"Bearer {self.api_key}"
 
-                resp = requests.post(f"{self.api_url.rstrip('/')}/jobs", json=payload, headers=headers, timeout=30)
+                resp = self._http().post(f"{self.api_url.rstrip('/')}/jobs", json=payload, headers=headers, timeout=API_TIMEOUT)
                 resp.raise_for_status()
                 data = resp.json()
                 job_id = data.get('job_id') or data.get('id')
@@ -109,13 +179,77 @@ class VEO3Client:
             logger.error("No VEO3 API URL configured (VEO3_API_URL or config.VEO3_API_URL)")
             return None
 
-    def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
-        """Get job status. Expected to return a dict with keys: status, result_url (if done)."""
+    def submit_batch(self, payloads: List[Dict[str, Any]], batch_size: int = 32) -> List[Optional[str]]:
+        """Submit several jobs with one `POST {api_url}/jobs:batch` per `batch_size`.
+
+        Expects `{"job_ids": [...]}` back, in payload order. Servers without
+        the batch endpoint (404/405) are remembered and sent one `submit_job`
+        per payload instead. Returns a job_id or None per payload.
+        """
+        if not self.api_url:
+            logger.error("No VEO3 API URL configured (VEO3_API_URL or config.VEO3_API_URL)")
+            return [None] * len(payloads)
+        import requests
+
+        job_ids: List[Optional[str]] = []
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        for start in range(0, len(payloads), batch_size):
+            group = payloads[start:start + batch_size]
+            if not self.batch_submit or len(group) == 1:
+                job_ids.extend(self.submit_job(payload) for payload in group)
+                continue
+            try:
+                resp = self._http().post(
+                    f"{self.api_url.rstrip('/')}/jobs:batch", json={"jobs": group}, headers=headers, timeout=API_TIMEOUT
+                )
+                if resp.status_code in (404, 405):
+                    logger.info("VEO3 API has no batch endpoint; submitting jobs one by one")
+                    self.batch_submit = False
+                    job_ids.extend(self.submit_job(payload) for payload in group)
+                    continue
+                resp.raise_for_status()
+                ids = resp.json().get('job_ids') or []
+                if len(ids) != len(group):
+                    logger.error("VEO3 batch submit returned %d job ids for %d jobs: %s", len(ids), len(group), resp.text)
+                job_ids.extend(str(job_id) if job_id else None for job_id in ids[:len(group)])
+                job_ids.extend([None] * (len(group) - len(ids)))
+            except requests.RequestException as e:
+                logger.error("VEO3 batch submit request failed: %s", e)
+                job_ids.extend([None] * len(group))
+            except Exception as e:
+                logger.exception("Unexpected error submitting VEO3 batch: %s", e)
+                job_ids.extend([None] * len(group))
+        return job_ids
+
+    def get_job_status(self, job_id: str, wait: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Get job status. Expected to return a dict with keys: status, result_url (if done).
+
+        With `wait`, asks the server to hold the request open for up to that
+        many seconds until the job changes state (`?wait=N` long-poll). A
+        server that rejects the parameter (400/405) is remembered and asked
+        again without it.
+        """
         if not self.api_url:
             logger.error("VEO3 get_job_status called but api_url not configured")
             return None
+        import requests
+
+        url = f"{self.api_url.rstrip('/')}/jobs/{job_id}"
         try:
-            resp = requests.get(f"{self.api_url.rstrip('/')}/jobs/{job_id}", timeout=20)
+            if wait and self.long_poll:
+                resp = self._http().get(url, params={'wait': wait}, timeout=(API_TIMEOUT[0], API_TIMEOUT[1] + wait))
+                if resp.status_code in (400, 405):
+                    logger.info("VEO3 API does not support long-polling; using plain polling")
+                    self.long_poll = False
+                    resp = self._http().get(url, timeout=API_TIMEOUT)
+            else:
+                resp = self._http().get(url, timeout=API_TIMEOUT)
+            if resp.status_code == 404:
+                # The server lost or expired the job; report it as final
+                logger.warning("VEO3 job %s not found", job_id)
+                return {'status': 'not_found'}
             resp.raise_for_status()
             return resp.json()
         except requests.RequestException as e:
@@ -127,14 +261,34 @@ class VEO3Client:
 
     def download_result(self, result_url: str, destination: Path) -> bool:
         """Download the result file from a presigned URL or http endpoint."""
+        import requests
+
+        # Download beside the destination and rename into place, so a failed
+        # download never leaves a partial file and no existing link is
+        # written through
+        tmp_path = destination.with_name(destination.name + '.part')
         try:
             destination.parent.mkdir(parents=True, exist_ok=True)
-            with requests.get(result_url, stream=True, timeout=60) as r:
+            with self._http().get(result_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
                 r.raise_for_status()
-                with open(destination, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+                # Let urllib3 undo any Content-Encoding, then copy in 1 MiB blocks
+                r.raw.decode_content = True
+                # Reuse one buffer instead of allocating bytes per chunk; the
+                # buffered writer writes each block in full
+                buf = memoryview(bytearray(DOWNLOAD_CHUNK_SIZE))
+                with open(tmp_path, 'wb') as f:
+                    size = int(r.headers.get('Content-Length') or 0)
+                    if size and hasattr(os, 'posix_fallocate'):
+                        # Reserve the whole file up front to avoid fragmentation
+                        os.posix_fallocate(f.fileno(), 0, size)
+                    while True:
+                        n = r.raw.readinto(buf)
+                        if not n:
+                            break
+                        f.write(buf[:n])
+                    # Drop any reserved tail if the body was shorter (e.g. compressed)
+                    f.truncate()
+            os.replace(tmp_path, destination)
             logger.info("Downloaded VEO3 result to %s", destination)
             return True
         except requests.RequestException as e:
@@ -143,105 +297,245 @@ class VEO3Client:
         except Exception as e:
             logger.exception("Unexpected error downloading result: %s", e)
             return False
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
 
-def generate_video_with_veo3(
-    prompt: str,
-    output_path: Path,
-    api_url: Optional[str] = None,
-    api_key: Optional[str] = None,
-    options: Optional[Dict[str, Any]] = None,
-    timeout_seconds: int = POLL_MAX_SECONDS,
-) -> Optional[Path]:
-    """High-level helper to generate video via VEO3-like API and save to `output_path`.
+def _prompt_cache_key(prompt: str, options: Optional[Dict[str, Any]]) -> str:
+    """Hash a prompt and its options into a cache key.
 
-    Returns `output_path` on success, or `None` on failure.
+    Whitespace and case are normalised first, so cosmetic edits to a prompt
+    still hit the cache.
+    """
+    normalized = re.sub(r'\s+', ' ', prompt).strip().lower()
+    blob = normalized + json.dumps(options or {}, sort_keys=True, default=str)
+    return hashlib.blake2b(blob.encode(), digest_size=16).hexdigest()
 
-    Options may include desired duration, resolution, voice settings, etc. The
-    payload shape depends on your provider; this helper sends a reasonable
-    generic payload and logs the full payload for debugging.
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy `src` over `dst` via a temp file and an atomic rename.
+
+    Output paths are rewritten in place by other writers, so cache entries
+    are never handed out as hardlinks; the rename also replaces (rather than
+    writes through) any link already at `dst`.
     """
-    client = VEO3Client(api_url=api_url, api_key=api_key)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dst.with_name(dst.name + '.tmp')
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _file_digest(path: Path) -> str:
+    """blake2b content hash of a file, read in DOWNLOAD_CHUNK_SIZE blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dedupe_video(path: Path, digest: str) -> None:
+    """Make byte-identical cache entries share one inode.
+
+    The first entry with a given content hash is hardlinked into
+    `CONTENT_STORE_DIR`; later identical entries are atomically replaced
+    by a hardlink to it. Only cache files are linked: they are written
+    solely by atomic renames, never in place, so a shared inode cannot be
+    modified through another path. Failures (e.g. a cross-device store)
+    keep the copy as is.
+    """
+    stored = CONTENT_STORE_DIR / f"{digest}.mp4"
+    try:
+        if stored.exists():
+            tmp_path = path.with_name(path.name + '.dedup')
+            tmp_path.unlink(missing_ok=True)
+            os.link(stored, tmp_path)
+            os.replace(tmp_path, path)
+        else:
+            CONTENT_STORE_DIR.mkdir(parents=True, exist_ok=True)
+            os.link(path, stored)
+    except OSError as e:
+        logger.debug("Could not deduplicate %s: %s", path, e)
 
-    if not client.is_configured():
-        logger.error("VEO3 client is not configured. Set VEO3_API_URL or an API key in config.")
+
+def _cached_video(key: str, output_path: Path) -> Optional[Path]:
+    """Copy a cached video to `output_path`; `None` on a miss."""
+    if not VEO3_CACHE_ENABLED:
         return None
+    cache_path = VEO_CACHE_DIR / f"{key}.mp4"
+    if not cache_path.exists():
+        return None
+    try:
+        _copy_file(cache_path, output_path)
+    except OSError as e:
+        logger.warning("Could not reuse cached Veo video %s: %s", key, e)
+        return None
+    disk_cache.touch(cache_path)
+    logger.info("Reusing cached Veo video %s for %s", key, output_path)
+    return output_path
+
+
+def _store_in_cache(key: str, video_path: Path, prompt: str, options: Optional[Dict[str, Any]]) -> None:
+    """Add a freshly generated video to the cache, with a JSON metadata sidecar."""
+    if not VEO3_CACHE_ENABLED:
+        return
+    try:
+        VEO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path = VEO_CACHE_DIR / f"{key}.mp4"
+        _copy_file(video_path, cache_path)
+        _dedupe_video(cache_path, _file_digest(cache_path))
+        meta = {'prompt': prompt, 'options': options or {}, 'created': int(time.time())}
+        (VEO_CACHE_DIR / f"{key}.json").write_text(json.dumps(meta, default=str))
+    except OSError as e:
+        logger.warning("Could not cache Veo video %s: %s", key, e)
+    # Keep the cache within its budget; content-store files whose cache
+    # entries were evicted are no longer linked from anywhere
+    disk_cache.evict(VEO_CACHE_DIR)
+    disk_cache.remove_unreferenced(CONTENT_STORE_DIR)
+
+
+@lru_cache(maxsize=1)
+def _lazy_genai():
+    """Import the optional Google GenAI (Veo) SDK on first use.
+
+    The SDK pulls in grpc/protobuf, so it is only loaded when the SDK path
+    is actually taken. Returns `(genai, types)`, or `(None, None)` when the
+    SDK is not installed.
+    """
+    try:
+        from google import genai
+        from google.genai import types
+    except Exception:
+        return None, None
+    return genai, types
 
-    # If an API key is provided and the Google GenAI SDK is available, prefer
-    # the SDK `models.generate_videos` method (Veo) which returns a long-running
-    # operation. This provides tighter integration with Gemini Veo models.
-    if client.api_key and GENAI_AVAILABLE:
-        try:
-            logger.info("Using Google GenAI SDK (veo model) to generate video")
-            # Initialize client with v1beta API version required for Veo
-            gen_client = genai.Client(
-                api_key=client.api_key,
-                http_options={'api_version': 'v1beta'}
-            )
 
-            # Model choice can be provided via options, otherwise use a working default
-            model_name = (options or {}).get('model') or 'veo-2.0-generate-001'
-
-            # Build config object if types available
-            gen_config = None
-            if types is not None and options:
-                cfg_kwargs = {}
-                if 'aspect_ratio' in options:
-                    cfg_kwargs['aspect_ratio'] = options['aspect_ratio']
-                if 'duration_seconds' in options:
-                    cfg_kwargs['duration_seconds'] = options['duration_seconds']
-                if 'number_of_videos' in options:
-                    cfg_kwargs['number_of_videos'] = options['number_of_videos']
-                # Add other supported options as needed
-                if cfg_kwargs:
-                    gen_config = types.GenerateVideosConfig(**cfg_kwargs)
-
-            operation = gen_client.models.generate_videos(
-                model=model_name,
-                prompt=prompt,
-                config=gen_config,
-            )
+@lru_cache(maxsize=4)
+def _genai_client(api_key: str):
+    """Create a Google GenAI client on the v1beta API version required for Veo.
 
-            logger.info("Waiting for Veo operation to complete...")
-            started = time.time()
-            poll_interval = POLL_INTERVAL_SECONDS
-            # Poll operation until done or timeout
-            while not getattr(operation, 'done', False):
-                if time.time() - started > timeout_seconds:
-                    logger.error("Veo SDK operation timed out after %s seconds", timeout_seconds)
-                    return None
-                time.sleep(poll_interval)
-                try:
-                    operation = gen_client.operations.get(operation)
-                except Exception:
-                    logger.debug("Failed to refresh operation; will retry")
-                poll_interval = min(poll_interval * 1.5, 10)
-
-            # Check result for generated videos (use result, not response)
-            result = getattr(operation, 'result', None) or getattr(operation, 'response', None)
-            if result and getattr(result, 'generated_videos', None):
-                generated = result.generated_videos[0]
-                # Download the video file using client.files.download
-                try:
-                    video_ref = getattr(generated, 'video', None)
-                    if not video_ref:
-                        logger.error("Generated video missing 'video' attribute")
-                        return None
-                    gen_client.files.download(file=video_ref, output_file_path=str(output_path))
-                    logger.info("Downloaded Veo video to %s", output_path)
-                    return output_path
-                except Exception as e:
-                    logger.error("Failed to download Veo file: %s", e)
-                    return None
-            else:
-                logger.error("Veo SDK operation completed but returned no videos: %s", result)
-                return None
-        except Exception as e:
-            logger.exception("Veo SDK generation failed: %s", e)
-            # Fall through to HTTP-based submission below
+    Cached per API key, so repeated generations share one client and its
+    HTTP connection pool.
+    """
+    genai, _ = _lazy_genai()
+    return genai.Client(api_key=api_key, http_options={'api_version': 'v1beta'})
 
-    # Fallback to the generic HTTP-based job submission pathway
-    payload = {
+
+@dataclass(frozen=True)
+class Veo3Options:
+    """Typed view of the Veo SDK settings carried in an `options` dict.
+
+    Frozen (hashable), so the SDK config built from it can be cached and
+    shared by every prompt in a batch.
+    """
+    model: str = 'veo-2.0-generate-001'
+    aspect_ratio: Optional[str] = None
+    duration_seconds: Optional[int] = None
+    number_of_videos: Optional[int] = None
+
+    @classmethod
+    def from_options(cls, options: Optional[Dict[str, Any]]) -> 'Veo3Options':
+        """Pick the SDK fields out of `options`; other keys (HTTP-only settings) are ignored."""
+        options = options or {}
+        kwargs = {f.name: options[f.name] for f in fields(cls) if options.get(f.name) is not None}
+        return cls(**kwargs)
+
+    def to_sdk_config(self):
+        """Return the matching `GenerateVideosConfig`, or None when nothing is set."""
+        return _sdk_config(self)
+
+
+@lru_cache(maxsize=32)
+def _sdk_config(veo_options: Veo3Options):
+    """Build (once per distinct settings) the SDK `GenerateVideosConfig`."""
+    _, types = _lazy_genai()
+    cfg_kwargs = {
+        f.name: getattr(veo_options, f.name)
+        for f in fields(veo_options)
+        if f.name != 'model' and getattr(veo_options, f.name) is not None
+    }
+    # Add other supported options as fields on Veo3Options
+    if types is None or not cfg_kwargs:
+        return None
+    return types.GenerateVideosConfig(**cfg_kwargs)
+
+
+def _next_poll_interval(previous: float) -> float:
+    """Back off exponentially with decorrelated jitter.
+
+    The jitter keeps concurrent clients from polling in lockstep.
+    """
+    upper = min(previous * POLL_BACKOFF_BASE, POLL_INTERVAL_MAX_SECONDS)
+    return random.uniform(POLL_INTERVAL_SECONDS, max(POLL_INTERVAL_SECONDS, upper))
+
+
+def _poll_operations(gen_client, operations: List[Any], timeout_seconds: int) -> List[Any]:
+    """Poll Veo operations in one shared loop until all are done.
+
+    Every pending operation is refreshed once per round, so K jobs cost one
+    sleep schedule rather than K. Operations still pending at the timeout
+    are replaced by `None`.
+    """
+    operations = list(operations)
+    pending = [i for i, op in enumerate(operations) if not getattr(op, 'done', False)]
+    deadline = time.monotonic() + timeout_seconds
+    poll_interval = POLL_INTERVAL_SECONDS
+    while pending:
+        if time.monotonic() >= deadline:
+            logger.error("Veo SDK operation timed out after %s seconds (%d pending)", timeout_seconds, len(pending))
+            for i in pending:
+                operations[i] = None
+            break
+        time.sleep(poll_interval)
+        for i in pending:
+            try:
+                operations[i] = gen_client.operations.get(operations[i])
+            except Exception:
+                logger.debug("Failed to refresh operation; will retry")
+        pending = [i for i in pending if not getattr(operations[i], 'done', False)]
+        poll_interval = _next_poll_interval(poll_interval)
+    return operations
+
+
+def _save_generated_video(gen_client, operation: Any, output_path: Path) -> Optional[Path]:
+    """Download the first video of a finished Veo operation to `output_path`."""
+    # Check result for generated videos (use result, not response)
+    result = getattr(operation, 'result', None) or getattr(operation, 'response', None)
+    if not (result and getattr(result, 'generated_videos', None)):
+        logger.error("Veo SDK operation completed but returned no videos: %s", result)
+        return None
+    # Download the video file using client.files.download
+    try:
+        video_ref = getattr(result.generated_videos[0], 'video', None)
+        if not video_ref:
+            logger.error("Generated video missing 'video' attribute")
+            return None
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Start a fresh inode rather than writing through any existing link
+        output_path.unlink(missing_ok=True)
+        gen_client.files.download(file=video_ref, output_file_path=str(output_path))
+        logger.info("Downloaded Veo video to %s", output_path)
+        return output_path
+    except Exception as e:
+        logger.error("Failed to download Veo file: %s", e)
+        return None
+
+
+_DONE_STATES = ('done', 'succeeded', 'completed')
+_FAILED_STATES = ('failed', 'error', 'not_found')
+
+
+def _job_status(status_resp: Dict[str, Any]) -> Optional[str]:
+    """Read the job state from a status response."""
+    return status_resp.get('status') or status_resp.get('state')
+
+
+def _job_payload(prompt: str, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the generic HTTP job submission payload."""
+    return {
         'prompt': prompt,
         'options': options or {},
         'metadata': {
@@ -250,48 +544,306 @@ def generate_video_with_veo3(
         }
     }
 
-    logger.info("Submitting VEO3 job: payload keys=%s", list(payload.keys()))
-    job_id = client.submit_job(payload)
-    if not job_id:
-        logger.error("Failed to submit VEO3 job")
-        return None
 
-    logger.info("VEO3 job submitted: %s; polling for completion...", job_id)
+def _poll_http_jobs(client: VEO3Client, job_ids: List[str], timeout_seconds: int) -> List[Optional[Dict[str, Any]]]:
+    """Poll VEO3 HTTP jobs in one shared loop until each one finishes.
 
-    started = time.time()
+    Each round checks every pending job once and then sleeps once, so K
+    concurrent jobs finish in roughly the time of the slowest one. Once a
+    single job is left it is long-polled, so completion is seen as soon as
+    the server reports it. Returns the final (done or failed) status
+    response per job, or `None` if it timed out.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(job_ids)
+    pending = list(range(len(job_ids)))
+    deadline = time.monotonic() + timeout_seconds
     sleep_interval = POLL_INTERVAL_SECONDS
-    while True:
-        if time.time() - started > timeout_seconds:
-            logger.error("VEO3 job %s timed out after %s seconds", job_id, timeout_seconds)
-            return None
+    while pending:
+        round_started = time.monotonic()
+        if round_started >= deadline:
+            for i in pending:
+                logger.error("VEO3 job %s timed out after %s seconds", job_ids[i], timeout_seconds)
+            break
+
+        # Long-polling one job at a time would delay the others, so only
+        # hold the request open when nothing else is waiting
+        wait = None
+        if len(pending) == 1:
+            wait = int(min(LONG_POLL_SECONDS, deadline - round_started)) or None
+        still_pending = []
+        eta_hints = []
+        for i in pending:
+            job_id = job_ids[i]
+            status_resp = client.get_job_status(job_id, wait=wait)
+            if not status_resp:
+                logger.warning("Empty status response for job %s; retrying...", job_id)
+                still_pending.append(i)
+                continue
+
+            status = _job_status(status_resp)
+            logger.info("VEO3 job %s status: %s", job_id, status)
+
+            if status in _DONE_STATES:
+                results[i] = status_resp
+            elif status in _FAILED_STATES:
+                logger.error("VEO3 job %s failed: %s", job_id, status_resp)
+                results[i] = status_resp
+            else:
+                # still pending/running -> check again next round
+                still_pending.append(i)
+                eta = status_resp.get('estimated_seconds_remaining')
+                if isinstance(eta, (int, float)):
+                    eta_hints.append(eta)
+
+        pending = still_pending
+        if pending:
+            sleep_interval = _next_poll_interval(sleep_interval)
+            if eta_hints:
+                # Trust the server's estimate for the soonest job, re-checking well before it
+                sleep_interval = min(max(POLL_INTERVAL_SECONDS, min(eta_hints) / 4), POLL_INTERVAL_MAX_SECONDS)
+            # Time spent in the round (e.g. a held long-poll) counts toward the wait
+            time.sleep(max(0.0, sleep_interval - (time.monotonic() - round_started)))
+    return results
+
+
+def _download_http_result(client: VEO3Client, job_id: str, status_resp: Dict[str, Any], output_path: Path) -> Optional[Path]:
+    """Download the artifact of a finished HTTP job to `output_path`."""
+    result_url = status_resp.get('result_url') or status_resp.get('output_url') or (status_resp.get('result') or {}).get('url')
+    if not result_url:
+        logger.error("Job %s reported success but no result_url present: %s", job_id, status_resp)
+        return None
+
+    ok = client.download_result(result_url, output_path)
+    return output_path if ok else None
+
+
+def _run_downloads(downloads: Dict[int, Callable[[], Optional[Path]]], results: List[Optional[Path]]) -> None:
+    """Run download callables concurrently, storing each result at its index.
+
+    Downloads are network-bound and release the GIL while waiting, so a
+    batch pulls its finished videos in parallel instead of one by one.
+    """
+    if not downloads:
+        return
+    with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(downloads))) as pool:
+        futures = {i: pool.submit(download) for i, download in downloads.items()}
+    for i, future in futures.items():
+        results[i] = future.result()
 
-        status_resp = client.get_job_status(job_id)
-        if not status_resp:
-            logger.warning("Empty status response for job %s; retrying...", job_id)
-            time.sleep(sleep_interval)
-            sleep_interval = min(sleep_interval * 1.5, 10)
+
+def _submit_operation(gen_client, jobs: JobStore, key: str, prompt: str, options: Optional[Dict[str, Any]]):
+    """Resume the recorded Veo operation for `key`, or submit a new one.
+
+    A recorded operation the server can no longer return (expired or lost)
+    is dropped and the prompt is submitted again.
+    """
+    record = jobs.get(key)
+    if record and record[0] == 'sdk':
+        _, types = _lazy_genai()
+        try:
+            operation = gen_client.operations.get(types.GenerateVideosOperation(name=record[1]))
+            logger.info("Resuming Veo operation %s", record[1])
+            return operation
+        except Exception as e:
+            logger.warning("Cannot resume Veo operation %s (%s); resubmitting", record[1], e)
+            jobs.delete(key)
+
+    veo_options = Veo3Options.from_options(options)
+    operation = gen_client.models.generate_videos(
+        model=veo_options.model,
+        prompt=prompt,
+        config=veo_options.to_sdk_config(),
+    )
+    if getattr(operation, 'name', None):
+        jobs.put(key, 'sdk', operation.name)
+    return operation
+
+
+def _submit_http_jobs(
+    client: VEO3Client, jobs: JobStore, keys: List[str], prompts: List[str], options: Optional[Dict[str, Any]]
+) -> List[Optional[str]]:
+    """Resume the recorded HTTP job for each key and batch-submit the rest.
+
+    A recorded job is only resumed if the server still reports it as live
+    or done; one that is missing, failed or unreadable is dropped and
+    submitted again.
+    """
+    job_ids: List[Optional[str]] = []
+    new = []
+    for i, key in enumerate(keys):
+        record = jobs.get(key)
+        if record and record[0] == 'http':
+            status_resp = client.get_job_status(record[1])
+            if status_resp and _job_status(status_resp) not in _FAILED_STATES:
+                logger.info("Resuming VEO3 job %s", record[1])
+                job_ids.append(record[1])
+                continue
+            logger.warning("Cannot resume VEO3 job %s; resubmitting", record[1])
+            jobs.delete(key)
+        job_ids.append(None)
+        new.append(i)
+    if not new:
+        return job_ids
+
+    payloads = [_job_payload(prompts[i], options) for i in new]
+    logger.info("Submitting %d VEO3 jobs: payload keys=%s", len(payloads), list(payloads[0].keys()))
+    for i, job_id in zip(new, client.submit_batch(payloads)):
+        if job_id:
+            jobs.put(keys[i], 'http', job_id)
+            job_ids[i] = job_id
+        else:
+            logger.error("Failed to submit VEO3 job")
+    return job_ids
+
+
+def _generate_videos_uncached(
+    client: VEO3Client,
+    keys: List[str],
+    prompts: List[str],
+    output_paths: List[Path],
+    options: Optional[Dict[str, Any]],
+    timeout_seconds: int,
+) -> List[Optional[Path]]:
+    """Submit (or resume) every job up front, then poll and download them together.
+
+    The Google GenAI SDK is preferred when an API key is set and the SDK is
+    installed; prompts it fails to submit fall back to the generic HTTP API
+    when one is configured. Jobs that time out stay in the job store, so the
+    next run for the same prompt resumes them instead of resubmitting, as
+    long as the record is recent and the server still knows the job.
+    """
+    results: List[Optional[Path]] = [None] * len(prompts)
+    jobs = JobStore()
+    http_pending = list(range(len(prompts)))
+
+    # If an API key is provided and the Google GenAI SDK is available, prefer
+    # the SDK `models.generate_videos` method (Veo) which returns a long-running
+    # operation. This provides tighter integration with Gemini Veo models.
+    if client.api_key and _lazy_genai()[0] is not None:
+        logger.info("Using Google GenAI SDK (veo model) to generate video")
+        operations = {}
+        http_pending = []
+        for i, prompt in enumerate(prompts):
+            try:
+                gen_client = _genai_client(client.api_key)
+                operations[i] = _submit_operation(gen_client, jobs, keys[i], prompt, options)
+            except Exception as e:
+                logger.exception("Veo SDK generation failed: %s", e)
+                # Fall through to HTTP-based submission below
+                http_pending.append(i)
+
+        if operations:
+            logger.info("Waiting for %d Veo operations to complete...", len(operations))
+            finished = _poll_operations(gen_client, list(operations.values()), timeout_seconds)
+            downloads = {}
+            for i, operation in zip(operations, finished):
+                if operation is not None:
+                    jobs.delete(keys[i])
+                    downloads[i] = partial(_save_generated_video, gen_client, operation, output_paths[i])
+            _run_downloads(downloads, results)
+
+    if not http_pending:
+        return results
+    # Fallback to the generic HTTP-based job submission pathway
+    if not client.api_url:
+        logger.error("No VEO3 API URL configured (VEO3_API_URL or config.VEO3_API_URL)")
+        return results
+
+    submitted = _submit_http_jobs(client, jobs, [keys[i] for i in http_pending], [prompts[i] for i in http_pending], options)
+    job_ids = {i: job_id for i, job_id in zip(http_pending, submitted) if job_id}
+
+    logger.info("Polling %d VEO3 jobs for completion...", len(job_ids))
+    finished = _poll_http_jobs(client, list(job_ids.values()), timeout_seconds)
+    downloads = {}
+    for (i, job_id), status_resp in zip(job_ids.items(), finished):
+        if status_resp is None:
             continue
+        jobs.delete(keys[i])
+        if _job_status(status_resp) in _DONE_STATES:
+            downloads[i] = partial(_download_http_result, client, job_id, status_resp, output_paths[i])
+    _run_downloads(downloads, results)
+    return results
 
-        status = status_resp.get('status') or status_resp.get('state')
-        logger.info("VEO3 job %s status: %s", job_id, status)
 
-        if status in ('done', 'succeeded', 'completed'):
-            result_url = status_resp.get('result_url') or status_resp.get('output_url') or (status_resp.get('result') or {}).get('url')
-            if not result_url:
-                logger.error("Job %s reported success but no result_url present: %s", job_id, status_resp)
-                return None
+def generate_videos_with_veo3_batch(
+    prompts: List[str],
+    output_paths: List[Path],
+    api_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    timeout_seconds: int = POLL_MAX_SECONDS,
+) -> List[Optional[Path]]:
+    """Generate several videos at once via the GenAI SDK or the HTTP API.
 
-            # Download
-            ok = client.download_result(result_url, output_path)
-            return output_path if ok else None
+    Jobs are submitted in windows of `MAX_PARALLEL_JOBS` and each window is
+    polled together, so wall time follows the slowest job per window
+    instead of the sum of all of them. Prompts already in the on-disk cache
+    are not submitted at all.
 
-        if status in ('failed', 'error'):
-            logger.error("VEO3 job %s failed: %s", job_id, status_resp)
-            return None
+    Returns one entry per prompt: its output path on success, else `None`.
+    """
+    keys = [_prompt_cache_key(prompt, options) for prompt in prompts]
+    results = [_cached_video(key, path) for key, path in zip(keys, output_paths)]
+    misses = [i for i, result in enumerate(results) if result is None]
+    if not misses:
+        return results
+
+    client = VEO3Client(api_url=api_url, api_key=api_key)
+    # Keep at most MAX_PARALLEL_JOBS in flight so large batches stay under
+    # the provider's rate limits
+    for start in range(0, len(misses), MAX_PARALLEL_JOBS):
+        window = misses[start:start + MAX_PARALLEL_JOBS]
+        generated = _generate_videos_uncached(
+            client,
+            [keys[i] for i in window],
+            [prompts[i] for i in window],
+            [output_paths[i] for i in window],
+            options,
+            timeout_seconds,
+        )
+        for i, path in zip(window, generated):
+            if path:
+                _store_in_cache(keys[i], path, prompts[i], options)
+                results[i] = path
+    return results
+
+
+def generate_video_with_veo3(
+    prompt: str,
+    output_path: Path,
+    api_url: Optional[str] = None,
+    api_key: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    timeout_seconds: int = POLL_MAX_SECONDS,
+) -> Optional[Path]:
+    """High-level helper to generate video via VEO3-like API and save to `output_path`.
+
+    Returns `output_path` on success, or `None` on failure.
+
+    Options may include desired duration, resolution, voice settings, etc. The
+    payload shape depends on your provider; this helper sends a reasonable
+    generic payload and logs the full payload for debugging.
+
+    A prompt that was already rendered with the same options is served from
+    the on-disk cache (`VEO_CACHE_DIR`) without contacting the API.
+    """
+    cache_key = _prompt_cache_key(prompt, options)
+    cached = _cached_video(cache_key, output_path)
+    if cached:
+        return cached
+
+    client = VEO3Client(api_url=api_url, api_key=api_key)
+
+    if not client.is_configured():
+        logger.error("VEO3 client is not configured. Set VEO3_API_URL or an API key in config.")
+        return None
 
-        # still pending/running -> wait
-        time.sleep(sleep_interval)
-        sleep_interval = min(sleep_interval * 1.5, 10)
+    result = _generate_videos_uncached(
+        client, [cache_key], [prompt], [output_path], options, timeout_seconds
+    )[0]
+    if result:
+        _store_in_cache(cache_key, result, prompt, options)
+    return result
 
 
 if __name__ == '__main__':
@@ -0,0 +1,93 @@
+"""
+Persistent record of in-flight Veo/VEO3 jobs.
+
+Video generation jobs run for minutes and are billed per submission. This
+module stores each submitted job in a small SQLite table keyed by the
+prompt cache key, so a run that crashes or times out resumes polling the
+same job next time instead of submitting a new one. Rows are removed once
+a job reaches a final state, and ignored (and removed) once they are older
+than `JOB_MAX_AGE_SECONDS`, since providers expire unfinished jobs.
+"""
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB_PATH = config.OUTPUT_DIR / '_veo_jobs.db'
+# Records older than this are treated as lost and resubmitted
+JOB_MAX_AGE_SECONDS = 6 * 60 * 60
+
+
+class JobStore:
+    """SQLite-backed map of prompt key -> (kind, job_id).
+
+    `kind` is 'sdk' for GenAI SDK operations (job_id is the operation name)
+    or 'http' for jobs on the generic VEO3 HTTP API. Storage errors are
+    logged and otherwise ignored: losing a record only costs a resubmission.
+    """
+
+    def __init__(self, path: Path = JOBS_DB_PATH, max_age: int = JOB_MAX_AGE_SECONDS):
+        self._conn: Optional[sqlite3.Connection] = None
+        self._max_age = max_age
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit; WAL lets concurrent runs read while one writes
+            self._conn = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "key TEXT PRIMARY KEY, kind TEXT NOT NULL, job_id TEXT NOT NULL, "
+                "submitted_at INTEGER NOT NULL)"
+            )
+        except sqlite3.Error as e:
+            logger.warning("Veo job store unavailable (%s); jobs will not be resumable", e)
+            self._conn = None
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return (kind, job_id) of the in-flight job for `key`, if any.
+
+        A record older than `max_age` is deleted and reported as absent.
+        """
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT kind, job_id, submitted_at FROM jobs WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Failed to read Veo job store: %s", e)
+            return None
+        if row is None:
+            return None
+        kind, job_id, submitted_at = row
+        if time.time() - submitted_at > self._max_age:
+            logger.info("Veo job %s is older than %d seconds; not resuming it", job_id, self._max_age)
+            self.delete(key)
+            return None
+        return kind, job_id
+
+    def put(self, key: str, kind: str, job_id: str) -> None:
+        """Record a freshly submitted job."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (key, kind, job_id, submitted_at) VALUES (?, ?, ?, ?)",
+                (key, kind, job_id, int(time.time())),
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to record Veo job %s: %s", job_id, e)
+
+    def delete(self, key: str) -> None:
+        """Forget the job for `key` once it has finished or failed."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute("DELETE FROM jobs WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning("Failed to clear Veo job record: %s", e)
@@ -1,21 +1,148 @@
 """
-Video assembly module using MoviePy.
+Video assembly module using ffmpeg, with MoviePy and OpenCV fallbacks.
 Combines charts, images, and audio into customer report videos.
 """
+import hashlib
+import json
 import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
 from datetime import timedelta
 
 import config
+from media import disk_cache
 
-# Optional VEO3 remote generator (prompt-based)
-try:
-    from media import veo3 as _veo3  # type: ignore
-    VEO3_AVAILABLE = bool(getattr(_veo3, 'VEO3_API_URL', None) or _veo3.VEO3Client().is_configured())
-except Exception:
-    _veo3 = None
-    VEO3_AVAILABLE = False
+
+@lru_cache(maxsize=1)
+def _veo3():
+    """Import the optional VEO3 remote generator (prompt-based) on first use.
+
+    Returns the `media.veo3` module when it imports and is configured,
+    else None. Deferred so importing this module does not load the
+    Veo client stack (GenAI SDK probe, job store) unless Veo is requested.
+    """
+    try:
+        from media import veo3  # type: ignore
+    except Exception:
+        return None
+    if getattr(veo3, 'VEO3_API_URL', None) or veo3.VEO3Client().is_configured():
+        return veo3
+    return None
+
+
+# Encoded report videos keyed by a hash of their inputs, LRU-evicted past
+# config.MEDIA_CACHE_MAX_BYTES
+VIDEO_CACHE_DIR = config.OUTPUT_DIR / '_video_cache'
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_exe() -> Optional[str]:
+    """Locate ffmpeg: on PATH, else the binary bundled with imageio-ffmpeg.
+
+    imageio-ffmpeg ships with MoviePy, so most installs have an ffmpeg
+    even when none is on PATH. Returns None if neither is available.
+    """
+    exe = shutil.which('ffmpeg')
+    if exe:
+        return exe
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+# Output options for every encode: the sections are still images,
+# rendered at SLIDESHOW_FPS and output at VIDEO_FPS (-r), and +faststart
+# puts the index up front so mailed videos start at once.
+_OUTPUT_PARAMS = [
+    '-r', str(config.VIDEO_FPS),
+    '-movflags', '+faststart',
+    '-pix_fmt', 'yuv420p',
+]
+
+# H.264 encoders by preference, each with (preset, options). The preset
+# is kept apart because MoviePy always passes one.
+_ENCODERS = {
+    'h264_nvenc': ('p4', ['-rc', 'vbr', '-cq', '23']),
+    'h264_qsv': ('veryfast', ['-global_quality', '23']),
+    'h264_videotoolbox': ('medium', ['-b:v', '2M']),
+    # Pin x264's default quality so VIDEO_PRESET trades only speed for
+    # size. No -threads: x264's own default (frame threads, ~1.5x logical
+    # cores) is faster than a fixed count.
+    'libx264': (config.VIDEO_PRESET, ['-crf', '23', '-tune', 'stillimage']),
+}
+
+
+# Platforms (sys.platform prefixes) each hardware encoder can exist on
+_HW_ENCODER_PLATFORMS = {
+    'h264_nvenc': ('linux', 'win32'),
+    'h264_qsv': ('linux', 'win32'),
+    'h264_videotoolbox': ('darwin',),
+}
+# Seconds a hardware encoder probe may take; a hung driver must not stall
+# the first video for long
+_ENCODER_PROBE_TIMEOUT = 5
+
+
+@lru_cache(maxsize=1)
+def _video_encoder() -> str:
+    """Pick the H.264 encoder named by config.VIDEO_ENCODER.
+
+    With 'auto', each hardware encoder available on this platform is tried
+    on a tiny test clip, since ffmpeg builds list encoders whose device is
+    missing; the first that works is used, else libx264.
+    """
+    import subprocess
+    import sys
+    
+    if config.VIDEO_ENCODER != 'auto':
+        return config.VIDEO_ENCODER
+    exe = _ffmpeg_exe()
+    if exe:
+        for name, platforms in _HW_ENCODER_PLATFORMS.items():
+            if not sys.platform.startswith(platforms):
+                continue
+            try:
+                probe = subprocess.run(
+                    [exe, '-hide_banner', '-loglevel', 'error',
+                     '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+                     '-c:v', name, '-f', 'null', '-'],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    timeout=_ENCODER_PROBE_TIMEOUT
+                )
+            except (OSError, subprocess.SubprocessError):
+                continue
+            if probe.returncode == 0:
+                logger.info("Using hardware video encoder %s", name)
+                return name
+    return 'libx264'
+
+
+def _encoder_params() -> List[str]:
+    """ffmpeg options selecting and tuning the video encoder."""
+    name = _video_encoder()
+    preset, params = _ENCODERS.get(name, (config.VIDEO_PRESET, []))
+    return ['-c:v', name, '-preset', preset, *params]
+
+
+def _moviepy_encode_kwargs() -> Dict:
+    """write_videofile arguments for the selected encoder."""
+    name = _video_encoder()
+    preset, params = _ENCODERS.get(name, (config.VIDEO_PRESET, []))
+    return {
+        'codec': name,
+        'preset': preset,
+        'ffmpeg_params': [*params, *_OUTPUT_PARAMS],
+    }
+
+
+# Sample rate narration is decoded at before muxing
+_AUDIO_FPS = 44100
 
 _moviepy_editor = None
 MOVIEPY_AVAILABLE = False
@@ -53,83 +180,357 @@ def ensure_moviepy_available() -> bool:
 
 logger = logging.getLogger(__name__)
 
+def _write_frames_ffmpeg(
+    frames: List,
+    output_path: Path,
+    fps: int,
+    duration_per_image: int,
+    audio_path: Optional[Path] = None
+) -> None:
+    """
+    Encode images to an MP4 by piping raw BGR frames to one ffmpeg process.
+    
+    Each image is written once as a single input frame lasting
+    duration_per_image seconds; ffmpeg's fps filter repeats it at the output
+    frame rate, so no duplicate frames cross the pipe. An audio track is
+    muxed in the same invocation, so there is no temp video or second pass.
+    
+    Raises:
+        RuntimeError: If ffmpeg exits with an error
+    """
+    import subprocess
+    
+    height, width = frames[0].shape[:2]
+    cmd = [
+        _ffmpeg_exe(), '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}',
+        '-framerate', f'1/{duration_per_image}', '-i', '-'
+    ]
+    if audio_path:
+        cmd += ['-i', str(audio_path)]
+    cmd += [
+        # libx264 4:2:0 needs even dimensions
+        '-vf', f'fps={fps},crop=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p',
+        *_encoder_params(), '-movflags', '+faststart'
+    ]
+    if audio_path:
+        cmd += [*_audio_params(audio_path), '-shortest']
+    cmd.append(str(output_path))
+    
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for frame in frames:
+            proc.stdin.write(frame)
+    except BrokenPipeError:
+        pass  # ffmpeg exited early; the reason is in its stderr
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg error: {stderr.decode(errors='replace')}")
+
+
+def _write_frames_opencv(frames: List, output_path: Path, fps: int, duration_per_image: int) -> None:
+    """Encode images with OpenCV's XVID writer, used when ffmpeg is not installed."""
+    import cv2
+    
+    height, width = frames[0].shape[:2]
+    fourcc = cv2.VideoWriter_fourcc(*'XVID')  # XVID codec - widely supported
+    out = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
+    write = out.write
+    frames_per_image = fps * duration_per_image
+    
+    for frame in frames:
+        # Write frames (duration_per_image seconds per image); the frame
+        # is invariant, so the loop is just the bound write call
+        for _ in range(frames_per_image):
+            write(frame)
+    
+    out.release()
+
+
 def create_video_opencv(image_paths, output_path, audio_path=None, fps=24, duration_per_image=3):
     """Create video from images using OpenCV - simple and reliable fallback"""
     import cv2
-    import subprocess
     
     if not image_paths:
         logger.error("No images provided")
         return None
     
-    # Read first image to get dimensions
-    first_img = cv2.imread(str(image_paths[0]))
-    if first_img is None:
+    # Decode images on a small thread pool (imread releases the GIL);
+    # map() keeps the results in input order
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        decoded = list(pool.map(lambda p: cv2.imread(str(p)), image_paths))
+    
+    # First image gives the dimensions
+    if decoded[0] is None:
         logger.error(f"Failed to read image: {image_paths[0]}")
         return None
     
-    height, width = first_img.shape[:2]
-    
-    # Create temporary video without audio
-    temp_video = output_path.parent / 'temp_video.avi'
-    fourcc = cv2.VideoWriter_fourcc(*'XVID')  # XVID codec - widely supported
-    out = cv2.VideoWriter(str(temp_video), fourcc, fps, (width, height))
+    height, width = decoded[0].shape[:2]
     
-    # Add each image as frames
-    for img_path in image_paths:
-        img = cv2.imread(str(img_path))
+    frames = []
+    for img_path, img in zip(image_paths, decoded):
         if img is None:
             logger.warning(f"Skipping invalid image: {img_path}")
             continue
         
-        # Resize if needed
+        # Resize once per image
         if img.shape[:2] != (height, width):
             img = cv2.resize(img, (width, height))
-        
-        # Write frames (duration_per_image seconds per image)
-        for _ in range(fps * duration_per_image):
-            out.write(img)
+        frames.append(img)
     
-    out.release()
-    logger.info(f"Video frames created: {temp_video}")
+    has_audio = bool(audio_path and audio_path.exists())
+    
+    if not _ffmpeg_exe():
+        _write_frames_opencv(frames, output_path, fps, duration_per_image)
+        if has_audio:
+            logger.warning("ffmpeg not found; video created without audio")
+        logger.info(f"Video created: {output_path}")
+        return output_path
     
-    # Add audio if provided using ffmpeg - always convert to MP4
-    if audio_path and audio_path.exists():
+    if has_audio:
         try:
-            cmd = [
-                'ffmpeg', '-y', '-i', str(temp_video), '-i', str(audio_path),
-                '-c:v', 'libx264', '-c:a', 'aac', '-pix_fmt', 'yuv420p',
-                '-shortest', str(output_path)
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                temp_video.unlink()
-                logger.info(f"Audio added to video: {output_path}")
-                return output_path
-            else:
-                logger.error(f"FFmpeg error: {result.stderr}")
-                raise Exception("FFmpeg failed")
-        except Exception as e:
+            _write_frames_ffmpeg(frames, output_path, fps, duration_per_image, audio_path)
+            logger.info(f"Audio added to video: {output_path}")
+            return output_path
+        except (OSError, RuntimeError) as e:
             logger.warning(f"Failed to add audio: {e}")
-            # Convert to MP4 without audio
-            try:
-                cmd = ['ffmpeg', '-y', '-i', str(temp_video), '-c:v', 'libx264', '-pix_fmt', 'yuv420p', str(output_path)]
-                subprocess.run(cmd, check=True, capture_output=True)
-                temp_video.unlink()
-                return output_path
-            except:
-                temp_video.rename(output_path)
-                return output_path
+    
+    # Video without audio
+    try:
+        _write_frames_ffmpeg(frames, output_path, fps, duration_per_image)
+    except (OSError, RuntimeError) as e:
+        logger.error(f"Video encoding failed: {e}")
+        return None
+    logger.info(f"Video created: {output_path}")
+    return output_path
+
+
+@lru_cache(maxsize=64)
+def _probe_audio(path_str: str, mtime_ns: int) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Read an audio file's duration and codec from the header ffmpeg prints
+    on open.
+    
+    Cached per file; `mtime_ns` is part of the key so a rewritten file is
+    probed again.
+    
+    Returns:
+        (duration in seconds, codec name); either is None if not reported
+    """
+    import re
+    import subprocess
+    
+    # Without an output ffmpeg only probes the input, then exits non-zero
+    proc = subprocess.run(
+        [_ffmpeg_exe(), '-hide_banner', '-i', path_str],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    duration = None
+    match = re.search(rb'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', proc.stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    codec = re.search(rb'Audio: (\w+)', proc.stderr)
+    return duration, codec.group(1).decode() if codec else None
+
+
+def _audio_params(audio_path: Path) -> List[str]:
+    """ffmpeg audio codec options: copy narration that is already AAC, else encode it."""
+    _, codec = _probe_audio(str(audio_path), audio_path.stat().st_mtime_ns)
+    return ['-c:a', 'copy' if codec == 'aac' else 'aac']
+
+
+@lru_cache(maxsize=256)
+def _title_card(
+    text: str,
+    size: tuple,
+    fontsize: int = 50,
+    color: str = 'white',
+    bg_color: str = '#0066cc'
+):
+    """
+    Render centred text on a solid background with PIL.
+    
+    Cached, so a card repeated across customers is drawn once.
+    
+    Returns:
+        Read-only RGB numpy array
+    """
+    import textwrap
+    import numpy as np
+    from PIL import Image, ImageDraw
+    from media.ai_images import load_font
+    
+    # Wrap long lines to the frame width, as TextClip's caption mode did
+    chars_per_line = max(1, int(size[0] * 0.9 / (fontsize * 0.6)))
+    text = '\n'.join(
+        textwrap.fill(line, chars_per_line) if line else line
+        for line in text.split('\n')
+    )
+    
+    image = Image.new('RGB', size, bg_color)
+    ImageDraw.Draw(image).multiline_text(
+        (size[0] / 2, size[1] / 2), text, fill=color,
+        font=load_font(fontsize, bold=True), anchor='mm', align='center'
+    )
+    frame = np.asarray(image)
+    frame.flags.writeable = False
+    return frame
+
+
+def _video_cache_key(intro_text: str, images: List[Path], audio_path: Optional[Path]) -> str:
+    """
+    Hash everything that ends up in an ffmpeg-assembled video.
+    
+    Covers the intro text, the encode settings and each image and narration
+    file by (path, size, mtime_ns), so regenerated inputs miss the cache
+    without the inputs being read on every call.
+    """
+    inputs = []
+    for path in [*images, audio_path]:
+        if path is None:
+            inputs.append(None)
+        else:
+            st = path.stat()
+            inputs.append([str(path.resolve()), st.st_size, st.st_mtime_ns])
+    settings = [
+        intro_text, list(config.VIDEO_RESOLUTION), config.VIDEO_FPS,
+        config.SLIDESHOW_FPS, config.VIDEO_PRESET, _video_encoder(), inputs
+    ]
+    return hashlib.blake2b(json.dumps(settings).encode(), digest_size=16).hexdigest()
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """
+    Copy `src` over `dst` via a temp file and an atomic rename.
+    
+    The rename replaces any hardlink already at `dst` instead of writing
+    through it, and readers never see a half-written video.
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dst.with_name(dst.name + '.tmp')
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _store_cached_video(video_path: Path, cache_path: Path) -> None:
+    """Copy a freshly encoded video into the cache (atomically; failures only logged)."""
+    try:
+        _copy_file(video_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache video {video_path}: {e}")
+    disk_cache.evict(cache_path.parent)
+
+
+def _run_ffmpeg(cmd: List[str]) -> None:
+    """
+    Run ffmpeg, streaming its stderr to the debug log line by line.
+    
+    Only the last 50 lines are kept for the error message, so memory stays
+    flat however much ffmpeg prints.
+    
+    Raises:
+        RuntimeError: If ffmpeg exits with an error
+    """
+    import subprocess
+    from collections import deque
+    
+    tail = deque(maxlen=50)
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace'
+    ) as proc:
+        for line in proc.stderr:
+            line = line.rstrip()
+            logger.debug("ffmpeg: %s", line)
+            tail.append(line)
+    if proc.returncode != 0:
+        raise RuntimeError("FFmpeg error: " + "\n".join(tail))
+
+
+def _assemble_with_ffmpeg(
+    intro_text: str,
+    images: List[Path],
+    audio_path: Optional[Path],
+    output_path: Path
+) -> Path:
+    """
+    Build a report video from an intro card, still images and narration in
+    a single ffmpeg run.
+    
+    The sections are a fixed concat of stills, so ffmpeg scales, pads and
+    joins them itself; nothing is composited frame by frame in Python.
+    Sections split the narration length evenly across four slots, as the
+    MoviePy path does.
+    
+    Args:
+        intro_text: Text for the intro card
+        images: Cover and chart images, in section order
+        audio_path: Narration to mux (optional)
+        output_path: Path to save video
+    
+    Returns:
+        output_path
+    
+    Raises:
+        RuntimeError: If the narration length is unreadable or ffmpeg fails
+    """
+    import tempfile
+    
+    if audio_path:
+        audio_duration, _ = _probe_audio(str(audio_path), audio_path.stat().st_mtime_ns)
+        if not audio_duration:
+            raise RuntimeError(f"Could not read duration of {audio_path}")
+        clip_duration = audio_duration / 4  # Split across 4 sections
     else:
-        # Convert to MP4 without audio
+        clip_duration = 4.0  # Default 4 seconds per section
+    
+    width, height = config.VIDEO_RESOLUTION
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        from PIL import Image
+        
+        intro_path = Path(tmp_dir) / 'intro.png'
+        Image.fromarray(_title_card(intro_text, tuple(config.VIDEO_RESOLUTION))).save(intro_path)
+        stills = [intro_path, *images]
+        
+        cmd = [_ffmpeg_exe(), '-y', '-loglevel', 'error']
+        for still in stills:
+            # Each still is read as a short looped input at the slideshow rate
+            cmd += ['-loop', '1', '-framerate', str(config.SLIDESHOW_FPS),
+                    '-t', f'{clip_duration:.3f}', '-i', str(still)]
+        if audio_path:
+            cmd += ['-i', str(audio_path)]
+        
+        # Fit each still inside the frame on black, then join them
+        scaled = ''.join(
+            f'[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,'
+            f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:black,setsar=1[v{i}];'
+            for i in range(len(stills))
+        )
+        joined = ''.join(f'[v{i}]' for i in range(len(stills)))
+        cmd += [
+            '-filter_complex', f'{scaled}{joined}concat=n={len(stills)}:v=1:a=0[v]',
+            '-map', '[v]',
+            *_encoder_params(), *_OUTPUT_PARAMS,
+        ]
+        if audio_path:
+            # Trim the narration to the video, like the MoviePy path
+            cmd += ['-map', f'{len(stills)}:a', *_audio_params(audio_path),
+                    '-t', f'{clip_duration * len(stills):.3f}']
+        # Encode beside the output and rename into place: a failed run leaves
+        # no partial video, and an existing link at output_path is replaced
+        # rather than written through
+        part_path = output_path.with_name(f"{output_path.stem}.part{output_path.suffix}")
+        cmd.append(str(part_path))
+        
         try:
-            cmd = ['ffmpeg', '-y', '-i', str(temp_video), '-c:v', 'libx264', '-pix_fmt', 'yuv420p', str(output_path)]
-            subprocess.run(cmd, check=True, capture_output=True)
-            temp_video.unlink()
-            return output_path
-        except:
-            temp_video.rename(output_path)
-            return output_path
+            _run_ffmpeg(cmd)
+            os.replace(part_path, output_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+    return output_path
 
 
 def _create_veo3_prompt_from_pitch(
@@ -168,6 +569,35 @@ Quality: HD 720p"""
     return prompt
 
 
+def _existing_files(paths: List[Optional[Path]]) -> Set[Path]:
+    """
+    Return the subset of `paths` that exist as files.
+    
+    Each distinct parent directory is listed once with os.scandir instead
+    of stat()ing every path.
+    
+    Args:
+        paths: Paths to check; None entries are ignored
+    
+    Returns:
+        Set of the paths that exist
+    """
+    by_dir: Dict[Path, List[Path]] = {}
+    for path in paths:
+        if path is not None:
+            by_dir.setdefault(path.parent, []).append(path)
+    
+    present = set()
+    for directory, dir_paths in by_dir.items():
+        try:
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            continue
+        present.update(path for path in dir_paths if path.name in names)
+    return present
+
+
 def create_text_clip(
     text: str,
     duration: float,
@@ -195,23 +625,53 @@ def create_text_clip(
             "MoviePy is not installed or could not be imported. Install with `pip install moviepy` and ensure ffmpeg is available on PATH."
         )
 
-    from moviepy.editor import TextClip, CompositeVideoClip, ColorClip
+    from moviepy.editor import ImageClip
 
-    # Create background
-    bg = ColorClip(size=size, color=bg_color, duration=duration)
+    # Drawn with PIL (no ImageMagick process per TextClip) and cached
+    card = _title_card(text, tuple(size), fontsize, color, bg_color)
+    return ImageClip(card).set_duration(duration)
 
-    # Create text
-    txt = TextClip(
-        text,
-        fontsize=fontsize,
-        color=color,
-        size=size,
-        method='caption',
-        align='center'
-    ).set_duration(duration)
 
-    # Composite
-    return CompositeVideoClip([bg, txt.set_position('center')])
+@lru_cache(maxsize=64)
+def _decoded_image(path_str: str, mtime_ns: int, size: tuple):
+    """
+    Decode an image, resize it to fit `size` keeping aspect ratio, and
+    centre it on a black `size` canvas.
+    
+    Cached so charts reused across a batch of videos are decoded once;
+    `mtime_ns` is part of the key so a rewritten file is decoded again.
+    The resize is the costliest step; Pillow-SIMD is a drop-in
+    replacement for Pillow with vectorised resamplers if it matters.
+    
+    Args:
+        path_str: Path to image file
+        mtime_ns: Modification time of the file (cache key only)
+        size: (width, height) to fit
+    
+    Returns:
+        Read-only RGB numpy array
+    """
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path_str) as img:
+        img = img.convert('RGB')
+    
+    # Portrait images fit the height, others the width
+    if img.height > img.width:
+        new_size = (max(1, round(img.width * size[1] / img.height)), size[1])
+    else:
+        new_size = (size[0], max(1, round(img.height * size[0] / img.width)))
+    if new_size != img.size:
+        img = img.resize(new_size, Image.LANCZOS)
+    
+    # Centre on black; a wide image taller than the frame is cropped
+    canvas = Image.new('RGB', size)
+    canvas.paste(img, ((size[0] - img.width) // 2, (size[1] - img.height) // 2))
+
+    frame = np.asarray(canvas)
+    frame.flags.writeable = False
+    return frame
 
 
 def create_image_clip(
@@ -235,22 +695,12 @@ def create_image_clip(
             "MoviePy is not installed or could not be imported. Install with `pip install moviepy` and ensure ffmpeg is available on PATH."
         )
 
-    from moviepy.editor import ImageClip, CompositeVideoClip, ColorClip
-
-    clip = ImageClip(str(image_path)).set_duration(duration)
-
-    # Get clip dimensions
-    clip_w, clip_h = clip.size if hasattr(clip, 'size') else (clip.w, clip.h)
-    
-    # Resize to fit while maintaining aspect ratio
-    if clip_h > clip_w:
-        clip = clip.resize(height=size[1])
-    else:
-        clip = clip.resize(width=size[0])
+    from moviepy.editor import ImageClip
 
-    # Center on black canvas
-    bg = ColorClip(size=size, color=(0, 0, 0), duration=duration)
-    return CompositeVideoClip([bg, clip.set_position('center')])
+    # Resized and centred once, so no frame is composited at render time
+    stat = image_path.stat()
+    frame = _decoded_image(str(image_path), stat.st_mtime_ns, tuple(size))
+    return ImageClip(frame).set_duration(duration)
 
 
 def assemble_customer_video(
@@ -288,7 +738,7 @@ def assemble_customer_video(
         ... )
     """
     # Try Veo3 generation first if requested and available
-    if use_veo3 and VEO3_AVAILABLE and sales_pitch:
+    if use_veo3 and sales_pitch and _veo3() is not None:
         logger.info("Attempting to generate video with Veo3 for %s", customer_name)
         veo3_prompt = _create_veo3_prompt_from_pitch(
             customer_name, segment, kpis, sales_pitch
@@ -309,6 +759,33 @@ def assemble_customer_video(
         else:
             logger.warning("Veo3 generation failed, falling back to MoviePy assembly")
     
+    # Check every input with one directory listing per folder
+    present = _existing_files([cover_image, audio_path, *charts.values()])
+    
+    # Stills plus narration need no per-frame compositing, so one ffmpeg
+    # process builds the video; MoviePy/OpenCV are only used without ffmpeg
+    # or when it fails
+    if _ffmpeg_exe():
+        intro_text = f"{customer_name}\nSegment: {segment.upper()}"
+        images = [cover_image] if cover_image in present else []
+        images += [charts[name] for name in ('spend_over_time', 'category_share') if charts.get(name) in present]
+        narration = audio_path if audio_path in present else None
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Identical inputs (e.g. a re-run) reuse the earlier encode
+            cached = VIDEO_CACHE_DIR / f"{_video_cache_key(intro_text, images, narration)}.mp4"
+            if cached.exists():
+                _copy_file(cached, output_path)
+                disk_cache.touch(cached)
+                logger.info(f"Reusing cached video for {output_path}")
+                return output_path
+            _assemble_with_ffmpeg(intro_text, images, narration, output_path)
+            _store_cached_video(output_path, cached)
+            logger.info(f"Video assembled: {output_path}")
+            return output_path
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"ffmpeg assembly failed, falling back to MoviePy: {e}")
+    
     # Fall back to MoviePy assembly
     if not ensure_moviepy_available():
         # Try OpenCV as final fallback
@@ -317,10 +794,10 @@ def assemble_customer_video(
             try:
                 # Gather all image paths
                 images = []
-                if cover_image and cover_image.exists():
+                if cover_image in present:
                     images.append(cover_image)
                 for chart_path in charts.values():
-                    if chart_path and chart_path.exists():
+                    if chart_path in present:
                         images.append(chart_path)
                 
                 if images:
@@ -343,11 +820,11 @@ def assemble_customer_video(
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         size = config.VIDEO_RESOLUTION
-        fps = config.VIDEO_FPS
+        fps = config.SLIDESHOW_FPS
         clips = []
         
         # Calculate durations
-        if audio_path and audio_path.exists():
+        if audio_path in present:
             audio = AudioFileClip(str(audio_path))
             audio_duration = audio.duration
             clip_duration = audio_duration / 4  # Split across 4 sections
@@ -355,67 +832,56 @@ def assemble_customer_video(
             audio = None
             clip_duration = 4.0  # Default 4 seconds per section
         
-        # 1. Intro card with name and segment
+        # Build the section clips. They are independent and dominated by
+        # image decode/resize (which releases the GIL), so construct them
+        # concurrently and keep them in section order.
         intro_text = f"{customer_name}\nSegment: {segment.upper()}"
-        try:
-            intro_clip = create_text_clip(intro_text, clip_duration, size, fontsize=50)
-            clips.append(intro_clip)
-        except Exception as e:
-            logger.warning(f"Failed to create intro clip: {e}")
+        tasks = [('intro', partial(create_text_clip, intro_text, clip_duration, size, fontsize=50))]
         
         # 2. Cover image
-        if cover_image and cover_image.exists():
-            try:
-                cover_clip = create_image_clip(cover_image, clip_duration, size)
-                clips.append(cover_clip)
-            except Exception as e:
-                logger.warning(f"Failed to create cover clip: {e}")
+        if cover_image in present:
+            tasks.append(('cover', partial(create_image_clip, cover_image, clip_duration, size)))
         
-        # 3. Spend over time chart
-        if 'spend_over_time' in charts and charts['spend_over_time'].exists():
-            try:
-                spend_clip = create_image_clip(
-                    charts['spend_over_time'], 
-                    clip_duration, 
-                    size
-                )
-                clips.append(spend_clip)
-            except Exception as e:
-                logger.warning(f"Failed to create spend chart clip: {e}")
+        # 3. Spend over time chart, 4. Category share chart
+        for chart_name, label in (('spend_over_time', 'spend chart'), ('category_share', 'category chart')):
+            if charts.get(chart_name) in present:
+                tasks.append((label, partial(create_image_clip, charts[chart_name], clip_duration, size)))
         
-        # 4. Category share chart
-        if 'category_share' in charts and charts['category_share'].exists():
-            try:
-                category_clip = create_image_clip(
-                    charts['category_share'], 
-                    clip_duration, 
-                    size
-                )
-                clips.append(category_clip)
-            except Exception as e:
-                logger.warning(f"Failed to create category chart clip: {e}")
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = [(label, pool.submit(fn)) for label, fn in tasks]
+            for label, future in futures:
+                try:
+                    clips.append(future.result())
+                except Exception as e:
+                    logger.warning(f"Failed to create {label} clip: {e}")
         
         # If no clips, create error message
         if not clips:
             logger.error("No clips could be created")
             return None
         
-        # Concatenate all clips
-        final_clip = concatenate_videoclips(clips, method="compose")
+        # Every section is a full-frame clip of `size`, so chain them
+        # instead of compositing the timeline per output frame
+        final_clip = concatenate_videoclips(clips, method="chain")
         
         # Add audio if available
         if audio:
-            # Trim or loop audio to match video length
-            if audio.duration > final_clip.duration:
-                audio = audio.subclip(0, final_clip.duration)
+            from moviepy.audio.AudioClip import AudioArrayClip
+
+            # Decode the narration once, trimmed to the video length, so the
+            # encode reads samples from memory instead of a second ffmpeg
+            # reader seeking through the source file
+            samples = audio.to_soundarray(fps=_AUDIO_FPS)
+            audio.close()
+            audio = AudioArrayClip(samples[:int(final_clip.duration * _AUDIO_FPS)], fps=_AUDIO_FPS)
             final_clip = final_clip.set_audio(audio)
         
         # Write video file
         final_clip.write_videofile(
             str(output_path),
             fps=fps,
-            codec='libx264',
             audio_codec='aac',
+            **_moviepy_encode_kwargs(),
             temp_audiofile=str(output_path.parent / 'temp_audio.m4a'),
             remove_temp=True,
             logger=None  # Suppress moviepy's verbose logging
@@ -430,9 +896,7 @@ def assemble_customer_video(
         return output_path
         
     except Exception as e:
-        logger.error(f"Video assembly error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Video assembly error: {e}")
         return None
 
 
@@ -477,7 +941,7 @@ def create_simple_video_from_images(
             logger.error("No valid images found")
             return None
         
-        final_clip = concatenate_videoclips(clips, method="compose")
+        final_clip = concatenate_videoclips(clips, method="chain")
         
         if audio_path and audio_path.exists():
             audio = AudioFileClip(str(audio_path))
@@ -487,9 +951,9 @@ def create_simple_video_from_images(
         
         final_clip.write_videofile(
             str(output_path),
-            fps=config.VIDEO_FPS,
-            codec='libx264',
+            fps=config.SLIDESHOW_FPS,
             audio_codec='aac',
+            **_moviepy_encode_kwargs(),
             logger=None
         )
         
@@ -519,12 +983,13 @@ def generate_video_from_prompt(
 
     Returns the `output_path` on success, or `None` on failure.
     """
-    logger.info("generate_video_from_prompt: use_veo_if_available=%s, VEO3_AVAILABLE=%s", use_veo_if_available, VEO3_AVAILABLE)
+    veo3 = _veo3() if use_veo_if_available else None
+    logger.info("generate_video_from_prompt: use_veo_if_available=%s, veo3_available=%s", use_veo_if_available, veo3 is not None)
 
-    if use_veo_if_available and VEO3_AVAILABLE and _veo3 is not None:
+    if veo3 is not None:
         try:
-            timeout = timeout_seconds or _veo3.POLL_MAX_SECONDS
-            res = _veo3.generate_video_with_veo3(
+            timeout = timeout_seconds or veo3.POLL_MAX_SECONDS
+            res = veo3.generate_video_with_veo3(
                 prompt=prompt,
                 output_path=output_path,
                 api_url=config.VEO3_API_URL or None,
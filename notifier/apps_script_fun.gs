@@ -36,7 +36,10 @@ var CONFIG = {
   fallbackPlainText: "This email looks best in an HTML-capable email client.",
   maxRetries: 3,
   retryDelayMs: 1000,
-  enableHappinessTracking: true
+  enableHappinessTracking: true,
+  // Seconds to remember each payload's idempotencyKey and skip repeats
+  // (0 = always send; CacheService allows at most 21600)
+  dedupeSeconds: 0
 };
 
 // Happiness Metrics Tracker
@@ -65,8 +68,12 @@ var HAPPINESS_METRICS = {
  *     }
  *   ],
  *   "customerName": "John Doe",  // Optional
- *   "segment": "vip"  // Optional - helps with happiness tracking
+ *   "segment": "vip",  // Optional - helps with happiness tracking
+ *   "idempotencyKey": "3f2a..."  // Optional - same key = same email (see CONFIG.dedupeSeconds)
  * }
+ * 
+ * Or many emails in one call: { "messages": [ <payload>, ... ] }
+ * The reply then carries one result per message in data.results.
  */
 function doPost(e) {
   try {
@@ -75,6 +82,17 @@ function doPost(e) {
     // Parse the magical payload
     var data = JSON.parse(e.postData.contents);
     
+    if (Array.isArray(data.messages)) {
+      try {
+        return sendBatch(data.messages);
+      } catch (error) {
+        // Some emails may already be out; the data key tells the client this
+        // deployment understood the batch, so it must not resend it
+        logWithEmoji("", "Batch aborted: " + error.toString());
+        return createResponse(false, "Batch aborted: " + error.toString(), { results: null });
+      }
+    }
+    
     // Validate - because we care!
     if (!validatePayload(data)) {
       return createResponse(false, "Missing required fields: to, subject, and htmlBody.");
@@ -103,6 +121,33 @@ function doPost(e) {
   }
 }
 
+/**
+ * 📦 Batch Sender
+ * Sends every message in one invocation, one result per message
+ */
+function sendBatch(messages) {
+  logWithEmoji("", `Batch of ${messages.length} email(s) received.`);
+  
+  var results = messages.map(function(data) {
+    try {
+      if (!data || !validatePayload(data)) {
+        return { success: false, error: "Missing required fields: to, subject, and htmlBody." };
+      }
+      var result = sendEmailWithRetry(data);
+      if (CONFIG.enableHappinessTracking) {
+        updateHappinessMetrics(result.success, data);
+      }
+      return result;
+    } catch (error) {
+      return { success: false, error: error.toString() };
+    }
+  });
+  
+  var delivered = results.filter(function(r) { return r.success; }).length;
+  logWithEmoji("", `Batch done: ${delivered}/${messages.length} delivered.`);
+  return createResponse(delivered === messages.length, `${delivered}/${messages.length} emails delivered.`, { results: results });
+}
+
 /**
  * 📧 The Email Sender Extraordinaire!
  * Sends emails with retries and happiness sprinkled in
@@ -111,6 +156,16 @@ function sendEmailWithRetry(data) {
   var attempts = 0;
   var lastError = null;
   
+  // Skip an email this deployment already delivered, if deduping is enabled
+  var cache = null;
+  if (CONFIG.dedupeSeconds > 0 && data.idempotencyKey) {
+    cache = CacheService.getScriptCache();
+    if (cache.get(data.idempotencyKey)) {
+      logWithEmoji("", "Duplicate of an email already sent; skipping.");
+      return { success: true, duplicate: true, attempts: 0 };
+    }
+  }
+  
   while (attempts < CONFIG.maxRetries) {
     try {
       attempts++;
@@ -137,6 +192,9 @@ function sendEmailWithRetry(data) {
       );
       
       // Success
+      if (cache) {
+        cache.put(data.idempotencyKey, "1", CONFIG.dedupeSeconds);
+      }
       HAPPINESS_METRICS.totalEmailsSent++;
       HAPPINESS_METRICS.successfulDeliveries++;
       HAPPINESS_METRICS.totalCustomersReached++;
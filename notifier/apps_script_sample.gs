@@ -27,14 +27,34 @@
  *   "to": "recipient@example.com",
  *   "subject": "Email subject",
  *   "htmlBody": "<html>...</html>",
- *   "attachments": ["https://url1.com/file.pdf"] // optional
+ *   "attachments": ["https://url1.com/file.pdf"], // optional
+ *   "idempotencyKey": "3f2a..." // optional; identical emails share a key
  * }
+ * 
+ * Or a batch, sent in one call:
+ * { "messages": [ { "to": ..., "subject": ..., "htmlBody": ... }, ... ] }
+ * answered with { "success": ..., "data": { "results": [ { "success": ... }, ... ] } }
  */
 function doPost(e) {
   try {
     // Parse JSON payload
     var data = JSON.parse(e.postData.contents);
     
+    if (Array.isArray(data.messages)) {
+      try {
+        return sendBatch(data.messages);
+      } catch (error) {
+        // Some emails may already be out; the data key tells the client this
+        // deployment understood the batch, so it must not resend it
+        Logger.log("Batch aborted: " + error.toString());
+        return ContentService.createTextOutput(JSON.stringify({
+          success: false,
+          error: error.toString(),
+          data: { results: null }
+        })).setMimeType(ContentService.MimeType.JSON);
+      }
+    }
+    
     // Validate required fields
     if (!data.to || !data.subject || !data.htmlBody) {
       return ContentService.createTextOutput(JSON.stringify({
@@ -82,6 +102,35 @@ function doPost(e) {
   }
 }
 
+/**
+ * Send each message of a batch, collecting one result per message.
+ */
+function sendBatch(messages) {
+  var results = messages.map(function(msg) {
+    if (!msg || !msg.to || !msg.subject || !msg.htmlBody) {
+      return { success: false, error: "Missing required fields: to, subject, htmlBody" };
+    }
+    try {
+      GmailApp.sendEmail(
+        msg.to,
+        msg.subject,
+        "Please view this email in an HTML-capable email client.",
+        { htmlBody: msg.htmlBody, name: "AI BI Reports System" }
+      );
+      Logger.log("Email sent successfully to: " + msg.to);
+      return { success: true };
+    } catch (error) {
+      Logger.log("Error sending email to " + msg.to + ": " + error.toString());
+      return { success: false, error: error.toString() };
+    }
+  });
+  
+  return ContentService.createTextOutput(JSON.stringify({
+    success: results.every(function(r) { return r.success; }),
+    data: { results: results }
+  })).setMimeType(ContentService.MimeType.JSON);
+}
+
 /**
  * Handle GET requests (for testing).
  * Returns a simple status message.
@@ -3,15 +3,172 @@ Email webhook client for sending reports via Google Apps Script.
 Enhanced with sales pitch support and attachment handling.
 Posts email data to a deployed Apps Script web app.
 """
+import atexit
+import gzip
+import hashlib
+import json
 import logging
+import re
+import string
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List
-from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import config
 
+# Optional fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# str.format conversion flags (!r, !s, !a)
+_CONVERSIONS = MappingProxyType({'r': repr, 's': str, 'a': ascii})
+
+# File extension at the end of a URL path, before any query or fragment
+_URL_EXT_RE = re.compile(r'\.([a-z0-9]+)(?:[?#]|$)', re.IGNORECASE)
+
+# Attachment MIME types by file extension
+_MIME_BY_EXT = MappingProxyType({
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.mp4': 'video/mp4',
+    '.zip': 'application/zip'
+})
+
+# Idempotency key -> monotonic time of the last successful send
+_recent_sends: Dict[str, float] = {}
+_recent_sends_lock = threading.Lock()
+_RECENT_SENDS_MAX = 1024
+
+
+@lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    """
+    Shared HTTP session for webhook calls.
+    
+    Reusing pooled keep-alive connections means only the first email pays
+    the TCP/TLS handshake. Connection failures and 429 rate limiting
+    (honouring Retry-After) are retried with backoff; read errors are not,
+    since a POST that reached Apps Script may already have sent the email.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3, connect=3, read=0, status=3,
+            status_forcelist=[429], allowed_methods=frozenset({'POST'}),
+            backoff_factor=1, respect_retry_after_header=True
+        )
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _encode_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a webhook payload to JSON bytes, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _idempotency_key(to_email: str, html_body: str) -> str:
+    """blake2b digest identifying an email by recipient and HTML body."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(to_email.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(html_body.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _send_key(message: Dict[str, Any]) -> str:
+    """Dedupe key of a built message (its idempotency key)."""
+    return message['idempotencyKey']
+
+
+def _recently_sent(key: str) -> bool:
+    """Whether this exact email went out within the dedupe window (opt-in)."""
+    window = config.WEBHOOK_DEDUPE_SECONDS
+    if window <= 0:
+        return False
+    with _recent_sends_lock:
+        sent_at = _recent_sends.get(key)
+    return sent_at is not None and time.monotonic() - sent_at < window
+
+
+def _mark_sent(key: str) -> None:
+    """Record a successful send, evicting the oldest entries past the cap."""
+    with _recent_sends_lock:
+        _recent_sends.pop(key, None)
+        _recent_sends[key] = time.monotonic()
+        while len(_recent_sends) > _RECENT_SENDS_MAX:
+            del _recent_sends[next(iter(_recent_sends))]
+
+
+def _build_message(
+    to_email: str,
+    subject: str,
+    html_body: str,
+    attachments: Optional[List[Dict[str, str]]] = None,
+    customer_name: Optional[str] = None,
+    segment: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the Apps Script payload for a single email."""
+    payload = {
+        "to": to_email,
+        "subject": subject,
+        "htmlBody": html_body,
+        "attachments": attachments or [],
+        # Lets the Apps Script side drop duplicates of the same email
+        "idempotencyKey": _idempotency_key(to_email, html_body)
+    }
+    
+    # Add optional tracking fields for the fun Apps Script
+    if customer_name:
+        payload["customerName"] = customer_name
+    if segment:
+        payload["segment"] = segment
+    
+    return payload
+
+
+def _post_webhook(payload: Dict[str, Any], timeout: float, idempotency_key: str) -> Dict[str, Any]:
+    """
+    POST a payload to the Apps Script webhook and return the decoded JSON reply.
+    
+    `idempotency_key` is sent as the Idempotency-Key header for endpoints
+    that can read headers; Apps Script doPost cannot, so each message also
+    carries it in its "idempotencyKey" field.
+    """
+    body = _encode_payload(payload)
+    headers = {'Content-Type': 'application/json', 'Idempotency-Key': idempotency_key}
+    if config.WEBHOOK_GZIP:
+        # HTML bodies compress well; level 1 gets most of the gain cheaply
+        body = gzip.compress(body, compresslevel=1)
+        headers['Content-Encoding'] = 'gzip'
+    
+    response = _session().post(
+        config.APPS_SCRIPT_WEBHOOK_URL,
+        data=body,
+        headers=headers,
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
+
 
 def send_email_webhook(
     to_email: str,
@@ -49,31 +206,12 @@ def send_email_webhook(
         logger.warning("Apps Script webhook URL not configured")
         return False
     
-    payload = {
-        "to": to_email,
-        "subject": subject,
-        "htmlBody": html_body,
-        "attachments": attachments or []
-    }
-    
-    # Add optional tracking fields for the fun Apps Script
-    if customer_name:
-        payload["customerName"] = customer_name
-    if segment:
-        payload["segment"] = segment
+    payload = _build_message(to_email, subject, html_body, attachments, customer_name, segment)
     
     try:
         logger.info(f"Sending email to {to_email} with {len(attachments or [])} attachments")
         
-        response = requests.post(
-            config.APPS_SCRIPT_WEBHOOK_URL,
-            json=payload,
-            timeout=30
-        )
-        
-        response.raise_for_status()
-        
-        result = response.json()
+        result = _post_webhook(payload, timeout=30, idempotency_key=payload['idempotencyKey'])
         
         if result.get('success'):
             logger.info(f"Email sent successfully to {to_email}")
@@ -92,6 +230,111 @@ def send_email_webhook(
         return False
 
 
+def _send_chunk(chunk: List[Dict[str, Any]]) -> List[bool]:
+    """Send one chunk of messages in a single webhook call."""
+    try:
+        logger.info(f"Sending batch of {len(chunk)} emails")
+        # Apps Script sends the chunk sequentially, so allow time per message
+        batch_key = hashlib.blake2b(
+            ''.join(m['idempotencyKey'] for m in chunk).encode(), digest_size=16
+        ).hexdigest()
+        result = _post_webhook({"messages": chunk}, timeout=30 + 5 * len(chunk), idempotency_key=batch_key)
+    except requests.exceptions.RequestException as e:
+        # Some of the chunk may already have gone out; don't resend
+        logger.error(f"Webhook batch request error: {e}")
+        return [False] * len(chunk)
+    except Exception as e:
+        logger.error(f"Email batch sending error: {e}")
+        return [False] * len(chunk)
+    
+    if 'data' not in result:
+        # Pre-batch deployments reject {"messages": ...} without a data key
+        # and without sending anything
+        logger.warning("Webhook does not support batches; sending emails individually")
+        return [send_email_webhook(
+            to_email=m['to'],
+            subject=m['subject'],
+            html_body=m['htmlBody'],
+            attachments=m.get('attachments'),
+            customer_name=m.get('customerName'),
+            segment=m.get('segment')
+        ) for m in chunk]
+    
+    results = (result.get('data') or {}).get('results')
+    if not isinstance(results, list) or len(results) != len(chunk):
+        # The batch failed partway (e.g. an error escaped sendBatch); some
+        # emails may have gone out, so mark the chunk failed rather than resend
+        logger.error(f"Webhook batch failed: {result.get('error') or result.get('message', 'Unknown error')}")
+        return [False] * len(chunk)
+    
+    sent = []
+    for message, item in zip(chunk, results):
+        ok = bool(isinstance(item, dict) and item.get('success'))
+        if not ok:
+            error = item.get('error', 'Unknown error') if isinstance(item, dict) else item
+            logger.error(f"Email sending failed for {message['to']}: {error}")
+        sent.append(ok)
+    logger.info(f"Batch sent: {sum(sent)}/{len(chunk)} emails delivered")
+    return sent
+
+
+def send_email_webhook_batch(
+    messages: List[Dict[str, Any]],
+    chunk_size: int = 20,
+    max_workers: int = 4
+) -> List[bool]:
+    """
+    Send many emails with one webhook call per chunk.
+    
+    Each chunk is posted as {"messages": [...]} and the Apps Script loops
+    over it server-side, so 25 emails cost two HTTPS round-trips instead
+    of 25. Deployments without batch support are detected from the reply
+    and fall back to one call per email.
+    
+    Args:
+        messages: Payload dicts with 'to', 'subject', 'htmlBody' and optional
+            'attachments', 'customerName', 'segment'
+        chunk_size: Maximum emails per webhook call
+        max_workers: Maximum chunks in flight at once
+    
+    Returns:
+        Success flag per message, in input order
+    """
+    if not messages:
+        return []
+    if not config.APPS_SCRIPT_WEBHOOK_URL:
+        logger.warning("Apps Script webhook URL not configured")
+        return [False] * len(messages)
+    
+    chunks = [messages[i:i + chunk_size] for i in range(0, len(messages), chunk_size)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        return [ok for sent in pool.map(_send_chunk, chunks) for ok in sent]
+
+
+@lru_cache(maxsize=8)
+def _parse_template(template: str) -> tuple:
+    """Split a str.format template into (literal, field, spec, conversion) parts once."""
+    return tuple(string.Formatter().parse(template))
+
+
+def _render_template(template: str, **fields: Any) -> str:
+    """
+    Fill a str.format template from its cached parse.
+    
+    Equivalent to template.format(**fields) for plain named fields, but
+    the large HTML template is parsed once instead of on every email.
+    """
+    parts = []
+    for literal, name, spec, conversion in _parse_template(template):
+        parts.append(literal)
+        if name is not None:
+            value = fields[name]
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            parts.append(format(value, spec))
+    return ''.join(parts)
+
+
 def format_customer_email(
     customer_name: str,
     customer_email: str,
@@ -125,19 +368,46 @@ def format_customer_email(
         charts_link = f'<a href="{charts_urls[0]}" class="button">View Charts</a>'
     
     # Format email using template
-    html = config.EMAIL_TEMPLATE.format(
-        name=customer_name,
-        segment=segment.upper(),
-        total_spend=kpis.get('total_spend', 0),
-        orders_count=kpis.get('orders_count', 0),
-        aov=kpis.get('average_order_value', 0),
-        frequency=kpis.get('order_frequency', 0),
-        top_category=kpis.get('top_category', 'N/A'),
+    return _format_cached(
+        config.EMAIL_TEMPLATE,
+        customer_name,
+        segment.upper(),
+        kpis.get('total_spend', 0),
+        kpis.get('orders_count', 0),
+        kpis.get('average_order_value', 0),
+        kpis.get('order_frequency', 0),
+        kpis.get('top_category', 'N/A'),
+        video_link,
+        charts_link
+    )
+
+
+@lru_cache(maxsize=256)
+def _format_cached(
+    template: str,
+    name: str,
+    segment: str,
+    total_spend: float,
+    orders_count: int,
+    aov: float,
+    frequency: float,
+    top_category: str,
+    video_link: str,
+    charts_link: str
+) -> str:
+    """Render `template`, memoized on the template and the exact values interpolated."""
+    return _render_template(
+        template,
+        name=name,
+        segment=segment,
+        total_spend=total_spend,
+        orders_count=orders_count,
+        aov=aov,
+        frequency=frequency,
+        top_category=top_category,
         video_link=video_link,
         charts_link=charts_link
     )
-    
-    return html
 
 
 def send_customer_report(
@@ -162,8 +432,81 @@ def send_customer_report(
     Returns:
         True if successful, False otherwise
     """
-    subject = f"Your Weekly BI Report - {customer_name}"
+    message = _customer_report_message(
+        customer_name, customer_email, segment, kpis, video_url, charts_urls
+    )
+    
+    # With WEBHOOK_DEDUPE_SECONDS set, an identical report just delivered
+    # (e.g. a repeated click) is not sent again
+    key = _send_key(message)
+    if _recently_sent(key):
+        logger.info(
+            f"Not sending report to {customer_email}: identical email already sent "
+            f"within {config.WEBHOOK_DEDUPE_SECONDS}s (WEBHOOK_DEDUPE_SECONDS)"
+        )
+        return True
+    
+    success = send_email_webhook(
+        to_email=message['to'],
+        subject=message['subject'],
+        html_body=message['htmlBody'],
+        attachments=message['attachments'],
+        customer_name=customer_name,
+        segment=segment
+    )
+    if success:
+        _mark_sent(key)
+    return success
+
+
+@lru_cache(maxsize=1)
+def _dispatch_executor() -> ThreadPoolExecutor:
+    """Background pool for fire-and-forget sends, drained at interpreter exit."""
+    executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='email-webhook')
+    atexit.register(executor.shutdown)
+    return executor
+
+
+def send_customer_report_async(
+    customer_name: str,
+    customer_email: str,
+    segment: str,
+    kpis: Dict[str, Any],
+    video_url: Optional[str] = None,
+    charts_urls: Optional[List[str]] = None
+) -> Future:
+    """
+    Queue a customer report for sending and return immediately.
+    
+    The webhook round-trip runs on a background thread over the shared
+    session, so UI callbacks don't block on the network.
     
+    Args:
+        customer_name: Customer's name
+        customer_email: Customer's email
+        segment: Customer segment
+        kpis: Dictionary of KPIs
+        video_url: Optional URL to video report
+        charts_urls: Optional list of chart URLs
+    
+    Returns:
+        Future resolving to True if the email was sent, False otherwise
+    """
+    return _dispatch_executor().submit(
+        send_customer_report,
+        customer_name, customer_email, segment, kpis, video_url, charts_urls
+    )
+
+
+def _customer_report_message(
+    customer_name: str,
+    customer_email: str,
+    segment: str,
+    kpis: Dict[str, Any],
+    video_url: Optional[str] = None,
+    charts_urls: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Build the webhook payload for one customer report."""
     html_body = format_customer_email(
         customer_name=customer_name,
         customer_email=customer_email,
@@ -173,9 +516,9 @@ def send_customer_report(
         charts_urls=charts_urls
     )
     
-    return send_email_webhook(
+    return _build_message(
         to_email=customer_email,
-        subject=subject,
+        subject=f"Your Weekly BI Report - {customer_name}",
         html_body=html_body,
         attachments=charts_urls or [],
         customer_name=customer_name,
@@ -183,6 +526,43 @@ def send_customer_report(
     )
 
 
+def send_customer_reports_batch(
+    jobs: List[Dict[str, Any]],
+    chunk_size: int = 20
+) -> List[bool]:
+    """
+    Send many customer reports in batched webhook calls.
+    
+    Args:
+        jobs: Keyword arguments for send_customer_report, one dict per customer
+        chunk_size: Maximum reports per webhook call
+    
+    Returns:
+        Success flag per job, in input order
+    """
+    messages = [_customer_report_message(**job) for job in jobs]
+    keys = [_send_key(m) for m in messages]
+    
+    # Only post reports not already delivered within the (opt-in) dedupe window
+    pending = []
+    for i, key in enumerate(keys):
+        if _recently_sent(key):
+            logger.info(
+                f"Not sending report to {messages[i]['to']}: identical email already sent "
+                f"within {config.WEBHOOK_DEDUPE_SECONDS}s (WEBHOOK_DEDUPE_SECONDS)"
+            )
+        else:
+            pending.append(i)
+    
+    sent = [True] * len(messages)
+    results = send_email_webhook_batch([messages[i] for i in pending], chunk_size=chunk_size)
+    for i, ok in zip(pending, results):
+        sent[i] = ok
+        if ok:
+            _mark_sent(keys[i])
+    return sent
+
+
 def send_sales_pitch_email(
     customer_name: str,
     customer_email: str,
@@ -212,17 +592,10 @@ def send_sales_pitch_email(
     attachments = []
     if attachment_urls:
         for i, url in enumerate(attachment_urls):
-            # Try to determine file type from URL
-            file_ext = Path(url).suffix.lower()
-            mime_types = {
-                '.pdf': 'application/pdf',
-                '.png': 'image/png',
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.mp4': 'video/mp4',
-                '.zip': 'application/zip'
-            }
-            mime_type = mime_types.get(file_ext, 'application/octet-stream')
+            # Try to determine file type from URL (ignoring any query/fragment)
+            match = _URL_EXT_RE.search(url)
+            file_ext = '.' + match.group(1).lower() if match else ''
+            mime_type = _MIME_BY_EXT.get(file_ext, 'application/octet-stream')
             
             attachments.append({
                 'name': f'attachment_{i+1}{file_ext}',
@@ -0,0 +1,22 @@
+"""
+Shared pytest fixtures.
+"""
+import pytest
+
+from bi import analysis
+from data import generator
+
+
+@pytest.fixture(scope="session")
+def sample_data():
+    """Generate sample data once for the whole test session."""
+    customers_df, orders_df = generator.generate_synthetic_data()
+    return customers_df, orders_df
+
+
+@pytest.fixture(scope="session")
+def kpis_for_first(sample_data):
+    """KPIs of the first sample customer, computed once per session."""
+    customers_df, orders_df = sample_data
+    customer_id = customers_df.iloc[0]['customer_id']
+    return customer_id, analysis.calculate_customer_kpis(customer_id, customers_df, orders_df)
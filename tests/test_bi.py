@@ -2,26 +2,17 @@
 Tests for BI analysis module.
 """
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import date, timedelta
 
 from bi import analysis
-from data import generator
+from bi.visuals import _downsample_m4
 
 
-@pytest.fixture
-def sample_data():
-    """Generate sample data for testing."""
-    customers_df, orders_df = generator.generate_synthetic_data()
-    return customers_df, orders_df
-
-
-def test_calculate_customer_kpis(sample_data):
+def test_calculate_customer_kpis(kpis_for_first):
     """Test KPI calculation for a customer."""
-    customers_df, orders_df = sample_data
-    
-    customer_id = customers_df.iloc[0]['customer_id']
-    kpis = analysis.calculate_customer_kpis(customer_id, customers_df, orders_df)
+    _, kpis = kpis_for_first
     
     # Check all expected fields are present
     assert 'total_spend' in kpis
@@ -42,9 +33,9 @@ def test_calculate_customer_kpis(sample_data):
     assert kpis['average_order_value'] >= 0
 
 
-def test_calculate_customer_kpis_nonexistent():
+def test_calculate_customer_kpis_nonexistent(sample_data):
     """Test KPI calculation for non-existent customer."""
-    customers_df, orders_df = generator.generate_synthetic_data()
+    customers_df, orders_df = sample_data
     
     kpis = analysis.calculate_customer_kpis("CUST9999", customers_df, orders_df)
     
@@ -163,12 +154,10 @@ def test_generate_summary_text():
     assert "electronics" in text
 
 
-def test_aov_calculation(sample_data):
+def test_aov_calculation(sample_data, kpis_for_first):
     """Test that average order value is calculated correctly."""
-    customers_df, orders_df = sample_data
-    
-    customer_id = customers_df.iloc[0]['customer_id']
-    kpis = analysis.calculate_customer_kpis(customer_id, customers_df, orders_df)
+    _, orders_df = sample_data
+    customer_id, kpis = kpis_for_first
     
     # Manually calculate AOV
     customer_orders = orders_df[orders_df['customer_id'] == customer_id]
@@ -179,3 +168,36 @@ def test_aov_calculation(sample_data):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+def test_downsample_m4_keeps_short_series():
+    """Test that series within the bin budget are returned unchanged."""
+    x = np.arange(40)
+    y = np.arange(40, dtype=float)
+    
+    out_x, out_y = _downsample_m4(x, y, n_bins=10)
+    
+    assert out_x is x
+    assert out_y is y
+
+
+def test_downsample_m4_keeps_extremes():
+    """Test that M4 keeps each bin's first, last, min and max points."""
+    n_bins = 10
+    dates = pd.date_range('2024-01-01', periods=1000, freq='h').to_numpy()
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=len(dates))
+    values[123] = 50.0
+    values[777] = -50.0
+    
+    out_x, out_y = _downsample_m4(dates, values, n_bins=n_bins)
+    
+    assert len(out_x) == len(out_y)
+    assert len(out_x) <= 4 * n_bins
+    # Endpoints and the global extremes survive, in x order
+    assert out_x[0] == dates[0] and out_x[-1] == dates[-1]
+    assert out_y.max() == 50.0 and out_y.min() == -50.0
+    assert (np.diff(out_x.astype(np.int64)) > 0).all()
+    # Every kept point is an original (x, y) pair
+    lookup = dict(zip(dates.astype(np.int64), values))
+    assert all(lookup[x] == y for x, y in zip(out_x.astype(np.int64), out_y))
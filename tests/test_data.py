@@ -5,6 +5,8 @@ import pytest
 from datetime import date
 import pandas as pd
 
+import config
+
 from data import generator, schema
 
 
@@ -38,9 +40,9 @@ def test_generate_synthetic_data():
     assert 'product_category' in orders_df.columns
 
 
-def test_customer_segments():
+def test_customer_segments(sample_data):
     """Test that all customer segments are valid."""
-    customers_df, _ = generator.generate_synthetic_data()
+    customers_df, _ = sample_data
     
     valid_segments = {"new", "returning", "vip", "at_risk"}
     actual_segments = set(customers_df['segment'].unique())
@@ -49,57 +51,59 @@ def test_customer_segments():
         f"Invalid segments found: {actual_segments - valid_segments}"
 
 
-def test_order_amounts_positive():
+def test_order_amounts_positive(sample_data):
     """Test that all order amounts are positive."""
-    _, orders_df = generator.generate_synthetic_data()
+    _, orders_df = sample_data
     
     assert (orders_df['amount'] > 0).all(), \
         "All order amounts should be positive"
 
 
-def test_customer_ids_unique():
+def test_customer_ids_unique(sample_data):
     """Test that customer IDs are unique."""
-    customers_df, _ = generator.generate_synthetic_data()
+    customers_df, _ = sample_data
     
     assert customers_df['customer_id'].is_unique, \
         "Customer IDs should be unique"
 
 
-def test_order_ids_unique():
+def test_order_ids_unique(sample_data):
     """Test that order IDs are unique."""
-    _, orders_df = generator.generate_synthetic_data()
+    _, orders_df = sample_data
     
     assert orders_df['order_id'].is_unique, \
         "Order IDs should be unique"
 
 
-def test_customer_id_format():
+def test_customer_id_format(sample_data):
     """Test customer ID format (CUST####)."""
-    customers_df, _ = generator.generate_synthetic_data()
+    customers_df, _ = sample_data
     
-    for cid in customers_df['customer_id']:
-        assert cid.startswith('CUST'), f"Customer ID should start with CUST: {cid}"
-        assert len(cid) == 8, f"Customer ID should be 8 characters: {cid}"
+    ids = customers_df['customer_id']
+    valid = ids.str.fullmatch(r'CUST\d{4}')
+    assert valid.all(), f"Customer IDs should match CUST####: {ids[~valid].tolist()}"
 
 
-def test_order_id_format():
+def test_order_id_format(sample_data):
     """Test order ID format (ORD########)."""
-    _, orders_df = generator.generate_synthetic_data()
+    _, orders_df = sample_data
     
-    for oid in orders_df['order_id']:
-        assert oid.startswith('ORD'), f"Order ID should start with ORD: {oid}"
-        assert len(oid) == 11, f"Order ID should be 11 characters: {oid}"
+    ids = orders_df['order_id']
+    valid = ids.str.fullmatch(r'ORD\d{8}')
+    assert valid.all(), f"Order IDs should match ORD########: {ids[~valid].tolist()}"
 
 
-def test_orders_per_customer():
+def test_orders_per_customer(sample_data):
     """Test that each customer has 3-5 orders."""
-    customers_df, orders_df = generator.generate_synthetic_data()
+    customers_df, orders_df = sample_data
     
-    for customer_id in customers_df['customer_id']:
-        customer_orders = orders_df[orders_df['customer_id'] == customer_id]
-        order_count = len(customer_orders)
-        assert 3 <= order_count <= 5, \
-            f"Customer {customer_id} should have 3-5 orders, has {order_count}"
+    counts = (
+        orders_df.groupby('customer_id').size()
+        .reindex(customers_df['customer_id'], fill_value=0)
+    )
+    in_range = counts.between(3, 5)
+    assert in_range.all(), \
+        f"Customers should have 3-5 orders: {counts[~in_range].to_dict()}"
 
 
 def test_pydantic_customer_model():
@@ -137,3 +141,64 @@ def test_pydantic_order_model():
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+@pytest.fixture
+def data_subset(sample_data, tmp_path, monkeypatch):
+    """A small copy of the sample data, saved under a temporary DATA_DIR."""
+    monkeypatch.setattr(config, "DATA_DIR", tmp_path)
+    customers_df, orders_df = sample_data
+    customers = customers_df.head(20).copy()
+    orders = orders_df[orders_df['customer_id'].isin(customers['customer_id'])].reset_index(drop=True)
+    return customers, orders
+
+
+@pytest.mark.skipif(not generator.PYARROW_AVAILABLE, reason="pyarrow not installed")
+def test_save_load_parquet_round_trip(data_subset, tmp_path, monkeypatch):
+    """Test that Parquet storage preserves dtypes and list columns."""
+    monkeypatch.setattr(config, "DATA_FORMAT", "parquet")
+    customers, orders = data_subset
+    
+    generator.save_data(customers, orders)
+    assert (tmp_path / "customers.parquet").exists()
+    assert not (tmp_path / "customers.csv").exists()
+    
+    loaded_customers, loaded_orders = generator.load_data()
+    
+    pd.testing.assert_frame_equal(loaded_customers, customers)
+    pd.testing.assert_frame_equal(loaded_orders, orders)
+    assert isinstance(loaded_customers['interests'].iloc[0], list)
+
+
+def test_save_load_csv_round_trip(data_subset, tmp_path, monkeypatch):
+    """Test that CSV storage writes list columns as JSON and reads them back."""
+    monkeypatch.setattr(config, "DATA_FORMAT", "csv")
+    customers, orders = data_subset
+    
+    generator.save_data(customers, orders)
+    raw = pd.read_csv(tmp_path / "customers.csv")
+    assert raw['interests'].iloc[0].startswith('["')
+    
+    loaded_customers, loaded_orders = generator.load_data()
+    
+    assert loaded_customers['interests'].tolist() == customers['interests'].tolist()
+    assert loaded_customers['pain_points'].tolist() == customers['pain_points'].tolist()
+    assert loaded_customers['created_at'].tolist() == customers['created_at'].tolist()
+    assert loaded_orders['order_date'].tolist() == orders['order_date'].tolist()
+    assert loaded_orders['amount'].tolist() == pytest.approx(orders['amount'].tolist())
+
+
+def test_load_csv_python_list_reprs(data_subset, tmp_path, monkeypatch):
+    """Test that CSVs holding Python list reprs (older files) still load."""
+    monkeypatch.setattr(config, "DATA_FORMAT", "csv")
+    customers, orders = data_subset
+    
+    customers.assign(
+        interests=customers['interests'].map(repr),
+        pain_points=customers['pain_points'].map(repr),
+    ).to_csv(tmp_path / "customers.csv", index=False)
+    orders.to_csv(tmp_path / "orders.csv", index=False)
+    
+    loaded_customers, _ = generator.load_data()
+    
+    assert loaded_customers['interests'].tolist() == customers['interests'].tolist()
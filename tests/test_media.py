@@ -4,14 +4,15 @@ Tests for media generation modules.
 import pytest
 from pathlib import Path
 import tempfile
+import time
 import shutil
 
-from media import tts, ai_images
+from media import tts, ai_images, veo_jobs
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def temp_dir():
-    """Create a temporary directory for tests."""
+    """Create a temporary directory shared by this module's tests (distinct filenames)."""
     temp_path = Path(tempfile.mkdtemp())
     yield temp_path
     shutil.rmtree(temp_path)
@@ -169,5 +170,71 @@ def test_video_handles_missing_assets():
     shutil.rmtree(temp_path)
 
 
+def test_video_falls_back_to_opencv_without_moviepy(temp_dir, monkeypatch):
+    """Without ffmpeg and MoviePy, assembly falls back to the OpenCV path."""
+    import sys
+    from media import video
+    
+    chart = temp_dir / "chart.png"
+    ai_images.create_placeholder_image("vip", ["tech"], chart)
+    
+    calls = []
+    monkeypatch.setattr(video, '_ffmpeg_exe', lambda: None)
+    monkeypatch.setitem(sys.modules, 'moviepy.editor', None)  # import raises ModuleNotFoundError
+    monkeypatch.setattr(video, 'MOVIEPY_AVAILABLE', False)
+    monkeypatch.setattr(video, 'ensure_opencv_available', lambda: True)
+    monkeypatch.setattr(
+        video, 'create_video_opencv',
+        lambda images, output_path, *args, **kwargs: calls.append(images) or output_path
+    )
+    
+    output = temp_dir / "output.mp4"
+    result = video.assemble_customer_video(
+        customer_name="Test Customer",
+        segment="vip",
+        kpis={},
+        charts={'spend_over_time': chart},
+        cover_image=None,
+        audio_path=None,
+        output_path=output
+    )
+    
+    assert result == output
+    assert calls == [[chart]]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+def test_job_store_round_trip(tmp_path):
+    """Test that a recorded Veo job can be read back and forgotten."""
+    store = veo_jobs.JobStore(path=tmp_path / "jobs.db")
+    
+    assert store.get("prompt-key") is None
+    
+    store.put("prompt-key", "http", "job-123")
+    assert store.get("prompt-key") == ("http", "job-123")
+    
+    # A new store on the same file resumes the record
+    assert veo_jobs.JobStore(path=tmp_path / "jobs.db").get("prompt-key") == ("http", "job-123")
+    
+    store.delete("prompt-key")
+    assert store.get("prompt-key") is None
+
+
+def test_job_store_expires_old_jobs(tmp_path, monkeypatch):
+    """Test that jobs older than max_age are dropped instead of resumed."""
+    store = veo_jobs.JobStore(path=tmp_path / "jobs.db", max_age=60)
+    store.put("prompt-key", "sdk", "operations/abc")
+    
+    submitted = time.time()
+    monkeypatch.setattr(veo_jobs.time, "time", lambda: submitted + 30)
+    assert store.get("prompt-key") == ("sdk", "operations/abc")
+    
+    monkeypatch.setattr(veo_jobs.time, "time", lambda: submitted + 120)
+    assert store.get("prompt-key") is None
+    
+    # The stale record was deleted, not just hidden
+    monkeypatch.undo()
+    assert store.get("prompt-key") is None
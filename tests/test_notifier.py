@@ -0,0 +1,162 @@
+"""
+Tests for the email webhook client.
+"""
+import pytest
+import requests
+
+import config
+from notifier import email_webhook
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    """Route webhook posts to a fake that records payloads and replies with `reply`."""
+    monkeypatch.setattr(config, "APPS_SCRIPT_WEBHOOK_URL", "https://script.example.com/exec")
+    monkeypatch.setattr(email_webhook, "_recent_sends", {})
+    
+    class FakeWebhook:
+        def __init__(self):
+            self.payloads = []
+            self.batch_reply = None
+        
+        def post(self, payload, timeout, idempotency_key):
+            self.payloads.append(payload)
+            if "messages" not in payload:
+                return {"success": True}
+            if self.batch_reply is not None:
+                return self.batch_reply(payload["messages"])
+            return {
+                "success": True,
+                "data": {"results": [{"success": True} for _ in payload["messages"]]}
+            }
+    
+    fake = FakeWebhook()
+    monkeypatch.setattr(email_webhook, "_post_webhook", fake.post)
+    return fake
+
+
+def _messages(count):
+    """Distinct single-email payloads for the batch API."""
+    return [
+        email_webhook._build_message(f"user{i}@example.com", "Report", f"<p>{i}</p>")
+        for i in range(count)
+    ]
+
+
+def _report_job(email="user@example.com"):
+    """Keyword arguments for one customer report."""
+    return {
+        "customer_name": "Test User",
+        "customer_email": email,
+        "segment": "vip",
+        "kpis": {"total_spend": 100.0, "orders_count": 1},
+    }
+
+
+def test_batch_posts_one_call_per_chunk(webhook):
+    """Test that messages are posted in chunks with per-message results."""
+    def reply(messages):
+        # The webhook reports the second message of each chunk as failed
+        return {"success": True, "data": {"results": [
+            {"success": i != 1, "error": "quota"} for i in range(len(messages))
+        ]}}
+    webhook.batch_reply = reply
+    
+    results = email_webhook.send_email_webhook_batch(_messages(25), chunk_size=10)
+    
+    assert len(webhook.payloads) == 3
+    assert sorted(len(p["messages"]) for p in webhook.payloads) == [5, 10, 10]
+    assert len(results) == 25
+    assert [i for i, ok in enumerate(results) if not ok] == [1, 11, 21]
+
+
+def test_batch_falls_back_for_pre_batch_webhooks(webhook):
+    """Test that a reply without a data key resends each message individually."""
+    webhook.batch_reply = lambda messages: {"success": False, "error": "Missing required fields"}
+    
+    results = email_webhook.send_email_webhook_batch(_messages(3))
+    
+    assert results == [True, True, True]
+    single = [p for p in webhook.payloads if "messages" not in p]
+    assert [p["to"] for p in single] == [f"user{i}@example.com" for i in range(3)]
+
+
+def test_batch_aborted_partway_is_not_resent(webhook):
+    """Test that a batch reply without per-message results marks the chunk failed."""
+    webhook.batch_reply = lambda messages: {
+        "success": False, "error": "Batch aborted", "data": {"results": None}
+    }
+    
+    results = email_webhook.send_email_webhook_batch(_messages(3))
+    
+    assert results == [False, False, False]
+    assert len(webhook.payloads) == 1
+
+
+def test_batch_request_error_is_not_resent(webhook, monkeypatch):
+    """Test that a failed batch request is reported, not retried per message."""
+    calls = []
+    
+    def failing_post(payload, timeout, idempotency_key):
+        calls.append(payload)
+        raise requests.exceptions.ReadTimeout("timed out")
+    monkeypatch.setattr(email_webhook, "_post_webhook", failing_post)
+    
+    assert email_webhook.send_email_webhook_batch(_messages(3)) == [False, False, False]
+    assert len(calls) == 1
+
+
+def test_dedupe_disabled_by_default(webhook, monkeypatch):
+    """Test that identical reports are all sent when the window is 0."""
+    monkeypatch.setattr(config, "WEBHOOK_DEDUPE_SECONDS", 0)
+    
+    assert email_webhook.send_customer_report(**_report_job())
+    assert email_webhook.send_customer_report(**_report_job())
+    
+    assert len(webhook.payloads) == 2
+
+
+def test_dedupe_suppresses_repeats_within_window(webhook, monkeypatch):
+    """Test that an identical report is not resent until the window passes."""
+    monkeypatch.setattr(config, "WEBHOOK_DEDUPE_SECONDS", 60)
+    now = [1000.0]
+    monkeypatch.setattr(email_webhook.time, "monotonic", lambda: now[0])
+    
+    assert email_webhook.send_customer_report(**_report_job())
+    now[0] += 30
+    assert email_webhook.send_customer_report(**_report_job())
+    assert len(webhook.payloads) == 1
+    
+    # A different recipient is a different email
+    assert email_webhook.send_customer_report(**_report_job("other@example.com"))
+    assert len(webhook.payloads) == 2
+    
+    now[0] += 31
+    assert email_webhook.send_customer_report(**_report_job())
+    assert len(webhook.payloads) == 3
+
+
+def test_dedupe_skips_reports_already_sent_in_batch(webhook, monkeypatch):
+    """Test that batch sends skip reports delivered within the window."""
+    monkeypatch.setattr(config, "WEBHOOK_DEDUPE_SECONDS", 60)
+    
+    assert email_webhook.send_customer_report(**_report_job("a@example.com"))
+    
+    jobs = [_report_job("a@example.com"), _report_job("b@example.com")]
+    assert email_webhook.send_customer_reports_batch(jobs) == [True, True]
+    
+    batch = webhook.payloads[-1]["messages"]
+    assert [m["to"] for m in batch] == ["b@example.com"]
+
+
+def test_dedupe_does_not_record_failed_sends(webhook, monkeypatch):
+    """Test that a failed send is retried even within the window."""
+    monkeypatch.setattr(config, "WEBHOOK_DEDUPE_SECONDS", 60)
+    replies = iter([{"success": False, "error": "quota"}, {"success": True}])
+    monkeypatch.setattr(
+        email_webhook, "_post_webhook",
+        lambda payload, timeout, idempotency_key: next(replies)
+    )
+    
+    assert not email_webhook.send_customer_report(**_report_job())
+    assert email_webhook.send_customer_report(**_report_job())
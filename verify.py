@@ -3,6 +3,7 @@
 Verification script to test the AI BI pipeline end-to-end.
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 print("=" * 60)
@@ -19,7 +20,7 @@ try:
     generator.save_data(customers_df, orders_df)
     print(f"Generated {len(customers_df)} customers")
     print(f"Generated {len(orders_df)} orders")
-    print(f"Data saved to CSV files")
+    print(f"Data files saved")
     test1_passed = True
 except Exception as e:
     print(f"✗ Error: {e}")
@@ -31,7 +32,8 @@ print("Test 2: BI Analysis & KPIs")
 print("-" * 60)
 try:
     from bi import analysis
-    customers_df, orders_df = generator.load_data()
+    if not test1_passed:
+        customers_df, orders_df = generator.load_data()
     customer_id = customers_df.iloc[0]['customer_id']
     customer_name = customers_df.iloc[0]['name']
     
@@ -48,89 +50,114 @@ except Exception as e:
     test2_passed = False
 print()
 
-# Test 3: Visualization
-print("Test 3: Chart Generation")
-print("-" * 60)
+# Tests 3-5 only read the data above and write separate files, so run them
+# concurrently; each collects its output to print in order afterwards.
+def _test_charts():
+    """Test 3: render and save the customer charts."""
+    lines = []
+    try:
+        from bi import visuals
+        
+        trend_df = analysis.get_recent_trend(customer_id, orders_df, days=90)
+        category_df = analysis.get_category_distribution(customer_id, orders_df)
+        
+        charts = visuals.save_all_customer_charts(
+            customer_id,
+            customer_name,
+            trend_df,
+            category_df,
+            subdirs['charts']
+        )
+        
+        lines.append(f"Generated charts for {customer_name}")
+        for chart_name, chart_path in charts.items():
+            lines.append(f"  - {chart_name}: {chart_path.name}")
+        return True, lines
+    except Exception as e:
+        import traceback
+        lines.append(f"✗ Error: {e}")
+        lines.append(traceback.format_exc())
+        return False, lines
+
+
+def _test_image():
+    """Test 4: generate the placeholder cover image."""
+    lines = []
+    try:
+        from media import ai_images
+        
+        customer = customers_df[customers_df['customer_id'] == customer_id].iloc[0]
+        cover_path = ai_images.generate_customer_image(
+            customer['segment'],
+            customer['interests'],
+            subdirs['images'] / "ai_cover.png",
+            use_openai=False,
+            use_gemini=False
+        )
+        
+        if cover_path and cover_path.exists():
+            lines.append(f"Generated placeholder image for {customer_name}")
+            lines.append(f"  - Segment: {customer['segment']}")
+            lines.append(f"  - Interests: {', '.join(customer['interests'][:3])}")
+            lines.append(f"  - Path: {cover_path}")
+            return True, lines
+        lines.append(f"Failed to generate image")
+        return False, lines
+    except Exception as e:
+        lines.append(f"✗ Error: {e}")
+        return False, lines
+
+
+def _test_email():
+    """Test 5: render the customer email template."""
+    lines = []
+    try:
+        from notifier import email_webhook
+        
+        customer = customers_df[customers_df['customer_id'] == customer_id].iloc[0]
+        html = email_webhook.format_customer_email(
+            customer_name=customer_name,
+            customer_email=customer['email'],
+            segment=customer['segment'],
+            kpis=kpis,
+            video_url=None,
+            charts_urls=None
+        )
+        
+        lines.append(f"Generated HTML email template")
+        lines.append(f"  - Length: {len(html)} characters")
+        lines.append(f"  - Contains customer name: {'YES' if customer_name in html else 'NO'}")
+        lines.append(f"  - Contains KPIs: {'YES' if str(kpis['total_spend']) in html else 'NO'}")
+        return True, lines
+    except Exception as e:
+        lines.append(f"✗ Error: {e}")
+        return False, lines
+
+
 try:
-    from bi import visuals
     import config
-    
-    trend_df = analysis.get_recent_trend(customer_id, orders_df, days=90)
-    category_df = analysis.get_category_distribution(customer_id, orders_df)
-    
     subdirs = config.get_customer_subdirs(customer_id)
-    charts = visuals.save_all_customer_charts(
-        customer_id,
-        customer_name,
-        trend_df,
-        category_df,
-        subdirs['charts']
-    )
-    
-    print(f"Generated charts for {customer_name}")
-    for chart_name, chart_path in charts.items():
-        print(f"  - {chart_name}: {chart_path.name}")
-    test3_passed = True
-except Exception as e:
-    print(f"✗ Error: {e}")
-    import traceback
-    traceback.print_exc()
-    test3_passed = False
-print()
+except Exception:
+    subdirs = None  # Each stage reports the failure itself
 
-# Test 4: AI Image Generation (Placeholder)
-print("Test 4: Image Generation")
-print("-" * 60)
-try:
-    from media import ai_images
-    
-    customer = customers_df[customers_df['customer_id'] == customer_id].iloc[0]
-    cover_path = ai_images.generate_customer_image(
-        customer['segment'],
-        customer['interests'],
-        subdirs['images'] / "ai_cover.png",
-        use_openai=False,
-        use_gemini=False
-    )
-    
-    if cover_path and cover_path.exists():
-        print(f"Generated placeholder image for {customer_name}")
-        print(f"  - Segment: {customer['segment']}")
-        print(f"  - Interests: {', '.join(customer['interests'][:3])}")
-        print(f"  - Path: {cover_path}")
-        test4_passed = True
-    else:
-        print(f"Failed to generate image")
-        test4_passed = False
-except Exception as e:
-    print(f"✗ Error: {e}")
-    test4_passed = False
-print()
+stages = [
+    ("Test 3: Chart Generation", _test_charts),
+    ("Test 4: Image Generation", _test_image),
+    ("Test 5: Email Template", _test_email),
+]
+with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+    futures = [pool.submit(fn) for _, fn in stages]
 
-# Test 5: Email Formatting
-print("Test 5: Email Template")
-print("-" * 60)
-try:
-    from notifier import email_webhook
-    
-    html = email_webhook.format_customer_email(
-        customer_name=customer_name,
-        customer_email=customer['email'],
-        segment=customer['segment'],
-        kpis=kpis,
-        video_url=None,
-        charts_urls=None
-    )
-    
-    print(f"Generated HTML email template")
-    print(f"  - Length: {len(html)} characters")
-    print(f"  - Contains customer name: {'YES' if customer_name in html else 'NO'}")
-    print(f"  - Contains KPIs: {'YES' if str(kpis['total_spend']) in html else 'NO'}")
-    test5_passed = True
-except Exception as e:
-    print(f"✗ Error: {e}")
-    test5_passed = False
-print()
+stage_passed = []
+for (title, _), future in zip(stages, futures):
+    passed_stage, lines = future.result()
+    print(title)
+    print("-" * 60)
+    for line in lines:
+        print(line)
+    print()
+    stage_passed.append(passed_stage)
+test3_passed, test4_passed, test5_passed = stage_passed
 
 # Summary
 print("=" * 60)